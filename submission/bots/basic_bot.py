@@ -1,5 +1,6 @@
 # submission/bots/basic_bot.py
-from Chessnut import Game
+from ..engine.board import Position, EMPTY, QUEEN, move_to, move_promo, move_to_uci
+from ..engine.mate import find_mate
 import random
 
 def chess_bot_basic(obs):
@@ -13,32 +14,35 @@ def chess_bot_basic(obs):
         A string representing the chosen move in UCI notation (e.g., "e2e4")
     """
     try:
-        # 0. Parse the current board state and generate legal moves using Chessnut library
-        game = Game(obs['board'])  # Changed from obs.board to obs['board']
-        moves = list(game.get_moves())
-
-        if not moves:  # No legal moves
-            return ""
-
-        # 1. Check a subset of moves for checkmate
-        for move in moves[:10]:
-            g = Game(obs['board'])
-            g.apply_move(move)
-            if g.status == Game.CHECKMATE:
-                return move
-
-        # 2. Check for captures
-        for move in moves:
-            if game.board.get_piece(Game.xy2i(move[2:4])) != ' ':
-                return move
+        # 0. Parse the current board state once; candidate moves are tried with make/unmake
+        pos = Position(obs['board'])
+
+        # 1. Checkmate in one, or a forced mate in two by checks. Quiet moves
+        # can mate too, so both stages are generated once here and reused below
+        noisy, quiet = [], []
+        pos.gen_noisy(noisy)
+        pos.gen_quiet(quiet)
+        mate = find_mate(pos, noisy + quiet)
+        if mate:
+            return move_to_uci(mate)
+
+        # 2. Check for captures; captures and promotions come from the noisy
+        # moves alone, so quiet moves are only checked for legality when neither is found
+        noisy = pos.legal_noisy(noisy)
+        for move in noisy:
+            if pos.squares[move_to(move)] != EMPTY:
+                return move_to_uci(move)
 
         # 3. Check for queen promotions
-        for move in moves:
-            if "q" in move.lower():
-                return move
+        for move in noisy:
+            if move_promo(move) == QUEEN:
+                return move_to_uci(move)
 
         # 4. Random move if no checkmates or captures
-        return random.choice(moves)
+        moves = noisy + pos.legal_quiet(quiet)
+        if not moves:  # No legal moves
+            return ""
+        return move_to_uci(random.choice(moves))
     except Exception as e:
         # If anything goes wrong, try to make a legal first move
         return "e2e4"
@@ -1,96 +1,54 @@
-from Chessnut import Game
+from ..engine.board import Position, EMPTY, WHITE, QUEEN, move_to, move_promo, move_to_uci
+from ..engine.pst import PST_MG, PST_EG
 import random
 
-# Piece values
-PIECE_VALUES = {
-    'P': 100,   # Pawn
-    'N': 320,   # Knight
-    'B': 330,   # Bishop
-    'R': 500,   # Rook
-    'Q': 900,   # Queen
-    'K': 20000  # King
-}
+# Material and position values folded into flat per-piece tables (see engine/pst.py):
+# PIECE_SQUARE_VALUES[is_endgame][piece * 64 + square], positive for White
+PIECE_SQUARE_VALUES = (PST_MG, PST_EG)
 
-# Position values for pieces (higher value = better square)
-PIECE_POSITION_VALUES = {
-    # Pawns prefer advancing and controlling center
-    'P': [
-        0,  0,  0,  0,  0,  0,  0,  0,
-        50, 50, 50, 50, 50, 50, 50, 50,
-        10, 10, 20, 30, 30, 20, 10, 10,
-        5,  5, 10, 25, 25, 10,  5,  5,
-        0,  0,  0, 20, 20,  0,  0,  0,
-        5, -5,-10,  0,  0,-10, -5,  5,
-        5, 10, 10,-20,-20, 10, 10,  5,
-        0,  0,  0,  0,  0,  0,  0,  0
-    ],
-    # Knights prefer central positions
-    'N': [
-        -50,-40,-30,-30,-30,-30,-40,-50,
-        -40,-20,  0,  0,  0,  0,-20,-40,
-        -30,  0, 10, 15, 15, 10,  0,-30,
-        -30,  5, 15, 20, 20, 15,  5,-30,
-        -30,  0, 15, 20, 20, 15,  0,-30,
-        -30,  5, 10, 15, 15, 10,  5,-30,
-        -40,-20,  0,  5,  5,  0,-20,-40,
-        -50,-40,-30,-30,-30,-30,-40,-50
-    ]
-}
+# Game phase (24 = all pieces on the board) at or below which we play for the endgame
+ENDGAME_PHASE = 8
 
 def evaluate_piece_position(piece, square_idx, is_endgame):
-    """Evaluate the positional value of a piece on a square"""
-    if piece.upper() not in PIECE_POSITION_VALUES:
-        return 0
-        
-    position_value = PIECE_POSITION_VALUES[piece.upper()][square_idx]
-    return position_value if piece.isupper() else -position_value
+    """Evaluate the material and positional value of a piece on a square"""
+    return PIECE_SQUARE_VALUES[is_endgame][piece * 64 + square_idx]
 
-def evaluate_position(game):
-    """Evaluate the current position"""
-    score = 0
-    piece_count = 0
-    
-    # Count material and pieces
-    for idx, piece in enumerate(game.board.get_pieces()):
-        if piece != ' ':
-            piece_count += 1
-            # Material value
-            value = PIECE_VALUES.get(piece.upper(), 0)
-            score += value if piece.isupper() else -value
-            
-            # Position value
-            is_endgame = piece_count <= 10
-            score += evaluate_piece_position(piece, idx, is_endgame)
-    
-    return score
+def evaluate_position(pos, is_endgame=None):
+    """Evaluate the current position from White's side (kept up to date by make/unmake)"""
+    if is_endgame is None:
+        is_endgame = pos.phase <= ENDGAME_PHASE
+    return pos.eg if is_endgame else pos.mg
 
-def evaluate_move(game, move):
+def evaluate_move(pos, move):
     """Evaluate a potential move"""
     score = 0
-    
-    # Make move on a copy of the game
-    test_game = Game(game.board.fen)
-    test_game.apply_move(move)
+    is_endgame = pos.phase <= ENDGAME_PHASE
+    sign = 1 if pos.side == WHITE else -1
     
     # Basic move scoring
-    to_square = Game.xy2i(move[2:4])
-    from_square = Game.xy2i(move[0:2])
-    
-    # Checkmate is best
-    if test_game.status == Game.CHECKMATE:
-        return 100000
+    to_square = move_to(move)
+    captured_piece = pos.squares[to_square]
     
     # Capture value
-    captured_piece = game.board.get_piece(to_square)
-    if captured_piece != ' ':
-        score += PIECE_VALUES.get(captured_piece.upper(), 0)
+    if captured_piece != EMPTY:
+        score += abs(evaluate_piece_position(captured_piece, to_square, is_endgame))
     
     # Promotion value
-    if 'q' in move.lower():
+    if move_promo(move) == QUEEN:
         score += 800
     
-    # Position evaluation
-    score += evaluate_position(test_game) - evaluate_position(game)
+    # Try the move in place and undo it afterwards
+    before = evaluate_position(pos, is_endgame)
+    pos.make(move)
+    
+    # Checkmate is best
+    if pos.is_checkmate():
+        pos.unmake()
+        return 100000
+    
+    # Position evaluation, from the mover's side
+    score += sign * (evaluate_position(pos, is_endgame) - before)
+    pos.unmake()
     
     return score
 
@@ -106,8 +64,8 @@ def chess_bot(obs):
     """
     try:
         # Parse the current board state
-        game = Game(obs['board'])
-        legal_moves = list(game.get_moves())
+        pos = Position(obs['board'])
+        legal_moves = pos.legal_moves()
         
         if not legal_moves:
             return ""
@@ -115,7 +73,7 @@ def chess_bot(obs):
         # Evaluate all possible moves
         move_scores = []
         for move in legal_moves:
-            score = evaluate_move(game, move)
+            score = evaluate_move(pos, move)
             move_scores.append((move, score))
         
         # Sort moves by score
@@ -132,21 +90,20 @@ def chess_bot(obs):
             for move, score in top_moves:
                 current_sum += max(score, 1)
                 if current_sum > rand_val:
-                    return move
+                    return move_to_uci(move)
             
             # Fallback to best move
-            return top_moves[0][0]
+            return move_to_uci(top_moves[0][0])
             
         # Fallback to random LEGAL move
-        return random.choice(legal_moves)
+        return move_to_uci(random.choice(legal_moves))
         
     except Exception as e:
         # Emergency fallback - return a legal move from initial position
         try:
-            game = Game(obs['board'])
-            legal_moves = list(game.get_moves())
+            legal_moves = Position(obs['board']).legal_moves()
             if legal_moves:
-                return random.choice(legal_moves)
+                return move_to_uci(random.choice(legal_moves))
             return ""
         except:
             return ""
@@ -0,0 +1,86 @@
+# submission/bots/dispatch_bot.py
+import logging
+
+from ..engine.timeman import read_clock, RESERVE
+from .basic_bot import chess_bot_basic
+from .hybrid_bot import chess_bot_hybrid
+from .search_bot import chess_bot_search
+
+logger = logging.getLogger(__name__)
+
+# Overage bank (seconds) below which the search gives way to the rule-based
+# bots: the hybrid bot first, the basic bot once the bank is nearly gone.
+# The time manager plans to spend the bank down to its reserve, so the search
+# keeps every move until the reserve itself is being eaten into.
+SEARCH_BANK = RESERVE
+HYBRID_BANK = 0.5
+# With this few pieces the search stays cheap and matters most (bitbases,
+# mates), so it is kept down to HYBRID_BANK
+SIMPLE_PIECES = 10
+# A running search keeps the position up to this many pieces above
+# SIMPLE_PIECES, so the dispatcher does not flip back and forth (each return
+# to the search restarts its game state and transposition table)
+PIECE_MARGIN = 2
+
+
+def piece_count(fen):
+    """Pieces on the board, read straight from the FEN placement field."""
+    return sum(c.isalpha() for c in fen.split(' ', 1)[0])
+
+
+def choose_strategy(remaining, pieces, current=None):
+    """
+    Name of the bot to use for a move, given the bank (None if unknown), the
+    piece count and the strategy used for the previous move.
+    """
+    if remaining is None or remaining >= SEARCH_BANK:
+        return 'search'
+    if remaining >= HYBRID_BANK:
+        limit = SIMPLE_PIECES + PIECE_MARGIN if current == 'search' else SIMPLE_PIECES
+        return 'search' if pieces <= limit else 'hybrid'
+    return 'basic'
+
+
+class Dispatcher:
+    """
+    Agent that picks a bot per move from the remaining clock and the size of
+    the position, logging every change of strategy.
+    """
+
+    bots = {'search': chess_bot_search, 'hybrid': chess_bot_hybrid, 'basic': chess_bot_basic}
+
+    def __init__(self):
+        self.strategy = None
+        self.switches = []  # (step, old, new) for every change of strategy
+
+    def __call__(self, obs, config=None):
+        remaining, step, _ = read_clock(obs, config)
+        strategy = choose_strategy(remaining, piece_count(obs['board']), self.strategy)
+        if strategy != self.strategy:
+            if self.strategy is not None:
+                self.switches.append((step, self.strategy, strategy))
+                # Warning level so the switch shows up under the default logging setup
+                logger.warning("step %d: %s -> %s (bank %s s)", step, self.strategy, strategy, remaining)
+            self.strategy = strategy
+        if strategy == 'search':
+            return chess_bot_search(obs, config)
+        return self.bots[strategy](obs)
+
+
+# Current strategy and switch log survive between calls
+dispatcher = Dispatcher()
+
+def chess_bot_dispatch(obs, config=None):
+    """
+    Chess bot that searches while the clock allows and falls back to the hybrid and basic
+    rule-based bots as the overage bank runs out.
+
+    Args:
+        obs: A dictionary with a 'board' key containing the FEN string of the current board state,
+            and optionally the 'remainingOverageTime' and 'step' clock fields.
+        config: The environment configuration, passed on to the search bot.
+
+    Returns:
+        A string representing the chosen move in UCI notation (e.g., "e2e4")
+    """
+    return dispatcher(obs, config)
@@ -0,0 +1,36 @@
+# submission/bots/search_bot.py
+from ..engine.board import Position, move_to_uci
+from ..engine.game import GameState
+from ..engine.timeman import read_clock, allocate
+import random
+
+# Board, move history, transposition table and PV survive between calls
+state = GameState()
+
+def chess_bot_search(obs, config=None):
+    """
+    Chess bot that runs an iterative-deepening alpha-beta search, budgeting each move from
+    the clock in the observation and keeping its game state between calls.
+
+    Args:
+        obs: A dictionary with a 'board' key containing the FEN string of the current board state,
+            and optionally the 'remainingOverageTime' and 'step' clock fields.
+        config: The environment configuration; its 'actTimeout' is the free time per move.
+
+    Returns:
+        A string representing the chosen move in UCI notation (e.g., "e2e4")
+    """
+    try:
+        soft, hard = allocate(*read_clock(obs, config))
+        move, _, _ = state.play(obs['board'], hard, soft)
+        return move_to_uci(move) if move else ""
+    except Exception as e:
+        # Emergency fallback: forget the game state and play any legal move
+        state.pos = None
+        try:
+            moves = Position(obs['board']).legal_moves()
+            if moves:
+                return move_to_uci(random.choice(moves))
+            return ""
+        except:
+            return ""
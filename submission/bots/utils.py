@@ -1,10 +0,0 @@
-# submission/bots/utils.py
-PIECE_VALUES = {
-    'P': 100,
-    'N': 320,
-    'B': 330,
-    'R': 500,
-    'Q': 900,
-    'K': 20000
-}
-
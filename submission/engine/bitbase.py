@@ -0,0 +1,153 @@
+# submission/engine/bitbase.py
+"""
+Endgame bitbases for king and pawn, king and rook, and king and queen
+against a lone king.
+
+Positions are normalised so the side with the extra piece is White. KPK
+keeps one win/draw bit per position with the pawn mirrored onto files
+a-d. KRK and KQK keep the distance to mate, in moves, as one nibble per
+position with the strong side to move and its king mirrored into the
+a1-d1-d4 triangle; when the lone king is to move its few replies are
+looked up instead. The tables are xz-compressed in bitbases.bin and
+each is unpacked the first time a position of its kind is probed.
+"""
+import os
+import lzma
+from struct import Struct
+
+from .board import WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, KING_ATTACKS, \
+    rook_attacks, bishop_attacks
+
+BITBASE_PATH = os.path.join(os.path.dirname(__file__), 'bitbases.bin')
+TABLES = ('kpk', 'krk', 'kqk')
+HEADER = Struct('>3I')  # compressed length of each table
+
+KPK_SIZE = 2 * 24 * 64 * 64  # side to move, pawn square, strong king, lone king
+PIECE_SIZE = 10 * 64 * 64  # strong king, piece, lone king
+TRIANGLE = (0, 1, 2, 3, 9, 10, 11, 18, 19, 27)  # a1 b1 c1 d1 b2 c2 d2 c3 d3 d4
+KING_INDEX = [-1] * 64
+for _i, _sq in enumerate(TRIANGLE):
+    KING_INDEX[_sq] = _i
+
+
+def queen_attacks(sq, occ):
+    return rook_attacks(sq, occ) | bishop_attacks(sq, occ)
+
+
+PIECE_TABLES = {ROOK: ('krk', rook_attacks), QUEEN: ('kqk', queen_attacks)}
+
+
+def _transpose(sq):
+    return ((sq & 7) << 3) | (sq >> 3)
+
+
+def kpk_index(wk, wp, bk, stm):
+    """Bit index of a KPK position; `stm` is 0 with the pawn side to move."""
+    if wp & 7 > 3:
+        wk, wp, bk = wk ^ 7, wp ^ 7, bk ^ 7
+    return ((stm * 24 + ((wp >> 3) - 1) * 4 + (wp & 7)) * 64 + wk) * 64 + bk
+
+
+def piece_index(wk, pc, bk):
+    """Nibble index of a KRK/KQK position with the strong side to move."""
+    if wk & 7 > 3:
+        wk, pc, bk = wk ^ 7, pc ^ 7, bk ^ 7
+    if wk >> 3 > 3:
+        wk, pc, bk = wk ^ 56, pc ^ 56, bk ^ 56
+    if wk >> 3 > wk & 7:
+        wk, pc, bk = _transpose(wk), _transpose(pc), _transpose(bk)
+    return (KING_INDEX[wk] * 64 + pc) * 64 + bk
+
+
+def strong_to_move(table, wk, pc, bk):
+    """Plies to mate with the strong side to move."""
+    i = piece_index(wk, pc, bk)
+    return 2 * ((table[i >> 1] >> ((i & 1) << 2)) & 15) + 1
+
+
+def lone_to_move(table, attacks, wk, pc, bk):
+    """Plies until the lone king is mated, or None if it draws."""
+    guarded = KING_ATTACKS[wk] | attacks(pc, (1 << wk) | (1 << pc))
+    moves = KING_ATTACKS[bk] & ~guarded
+    if not moves:
+        return 0 if guarded >> bk & 1 else None
+    if moves >> pc & 1:
+        return None  # the unprotected piece is taken
+    worst = 0
+    while moves:
+        low = moves & -moves
+        moves ^= low
+        plies = strong_to_move(table, wk, pc, low.bit_length() - 1)
+        if plies > worst:
+            worst = plies
+    return worst + 1
+
+
+_compressed = None
+_tables = {}
+
+
+def load_table(name):
+    """The unpacked table `name`, decompressing it on first use; None if unavailable."""
+    global _compressed
+    table = _tables.get(name)
+    if table is None:
+        if _compressed is None:
+            _compressed = {}
+            try:
+                with open(BITBASE_PATH, 'rb') as f:
+                    data = f.read()
+                offset = HEADER.size
+                for table_name, length in zip(TABLES, HEADER.unpack_from(data)):
+                    _compressed[table_name] = data[offset:offset + length]
+                    offset += length
+            except (OSError, ValueError):
+                pass
+        blob = _compressed.get(name)
+        if blob is None:
+            return None
+        table = _tables[name] = lzma.decompress(blob)
+    return table
+
+
+def probe(pos):
+    """
+    Exact result of a position with a lone king against king and one piece.
+
+    Returns None for positions the bitbases do not cover, else (result,
+    plies): result is 1, 0 or -1 for a win, draw or loss of the side to
+    move, and plies the distance to mate (None for KPK wins, which are
+    stored without distance).
+    """
+    occupied = pos.occupied
+    if (occupied[WHITE] | occupied[BLACK]).bit_count() != 3:
+        return None
+    strong = WHITE if occupied[WHITE].bit_count() == 2 else BLACK
+    base = strong * 6
+    bb = pos.bb
+    if bb[base + KNIGHT] or bb[base + BISHOP]:
+        return 0, 0
+    flip = 56 if strong == BLACK else 0
+    wk = (bb[base + KING].bit_length() - 1) ^ flip
+    bk = (bb[(6 - base) + KING].bit_length() - 1) ^ flip
+    to_move = 0 if pos.side == strong else 1
+
+    if bb[base + PAWN]:
+        table = load_table('kpk')
+        if table is None:
+            return None
+        i = kpk_index(wk, (bb[base + PAWN].bit_length() - 1) ^ flip, bk, to_move)
+        if table[i >> 3] >> (i & 7) & 1:
+            return (1 if to_move == 0 else -1), None
+        return 0, 0
+
+    piece = ROOK if bb[base + ROOK] else QUEEN
+    name, attacks = PIECE_TABLES[piece]
+    table = load_table(name)
+    if table is None:
+        return None
+    pc = (bb[base + piece].bit_length() - 1) ^ flip
+    if to_move == 0:
+        return 1, strong_to_move(table, wk, pc, bk)
+    plies = lone_to_move(table, attacks, wk, pc, bk)
+    return (0, 0) if plies is None else (-1, plies)
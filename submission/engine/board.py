@@ -0,0 +1,725 @@
+# submission/engine/board.py
+"""
+Bitboard chess position with pseudo-legal/legal move generation and
+in-place make/unmake.
+
+Squares are numbered a1=0 ... h8=63. Moves are 16-bit integers:
+bits 0-5 hold the from square, bits 6-11 the to square, bits 12-13 the
+promotion piece (knight, bishop, rook, queen) and bits 14-15 a flag
+(normal, promotion, en passant, castling). The value 0 is never a legal
+move and is used as "no move".
+
+Every position carries a 64-bit Zobrist key, a second one of its pawns
+alone, and the middlegame/endgame material + piece-square sums (`mg`,
+`eg`) with the game phase, all of which make/unmake keep up to date. The
+en passant square is only recorded (and hashed) when a pawn of the side
+to move could actually capture there, so transpositions hash equal
+whatever FEN convention produced them.
+"""
+from random import Random
+
+from .pst import PST_MG, PST_EG, PHASE_WEIGHTS
+
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+EMPTY = 12  # piece code of an empty square; pieces are color * 6 + type
+
+NORMAL, PROMOTION, EN_PASSANT, CASTLING = 0, 1, 2, 3
+NO_MOVE = 0
+
+PIECE_SYMBOLS = 'PNBRQKpnbrqk'
+PROMO_SYMBOLS = 'nbrq'
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+FULL = (1 << 64) - 1
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+RANK_1 = 0xFF
+RANK_3 = RANK_1 << 16
+RANK_6 = RANK_1 << 40
+RANK_8 = RANK_1 << 56
+NOT_FILE_A = FULL ^ FILE_A
+NOT_FILE_H = FULL ^ FILE_H
+
+# Castling rights bits
+WK, WQ, BK, BQ = 1, 2, 4, 8
+
+
+def square_name(sq):
+    return 'abcdefgh'[sq & 7] + str((sq >> 3) + 1)
+
+
+def parse_square(name):
+    return (ord(name[0]) - 97) + 8 * (ord(name[1]) - 49)
+
+
+def _leaper_table(deltas):
+    table = []
+    for sq in range(64):
+        f, r = sq & 7, sq >> 3
+        bits = 0
+        for df, dr in deltas:
+            if 0 <= f + df < 8 and 0 <= r + dr < 8:
+                bits |= 1 << (sq + df + 8 * dr)
+        table.append(bits)
+    return table
+
+
+def _ray_table(df, dr):
+    table = []
+    for sq in range(64):
+        f, r = (sq & 7) + df, (sq >> 3) + dr
+        bits = 0
+        while 0 <= f < 8 and 0 <= r < 8:
+            bits |= 1 << (f + 8 * r)
+            f, r = f + df, r + dr
+        table.append(bits)
+    return table
+
+
+KNIGHT_ATTACKS = _leaper_table(
+    [(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)])
+KING_ATTACKS = _leaper_table(
+    [(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)])
+# PAWN_ATTACKS[color][sq]: squares attacked by a pawn of `color` on `sq`
+PAWN_ATTACKS = [_leaper_table([(-1, 1), (1, 1)]), _leaper_table([(-1, -1), (1, -1)])]
+
+# Rays that grow towards higher square indices use the lowest blocker,
+# the others the highest one.
+RAY_N, RAY_E, RAY_NE, RAY_NW = (_ray_table(0, 1), _ray_table(1, 0),
+                                _ray_table(1, 1), _ray_table(-1, 1))
+RAY_S, RAY_W, RAY_SW, RAY_SE = (_ray_table(0, -1), _ray_table(-1, 0),
+                                _ray_table(-1, -1), _ray_table(1, -1))
+
+ROOK_MASK = [RAY_N[s] | RAY_E[s] | RAY_S[s] | RAY_W[s] for s in range(64)]
+BISHOP_MASK = [RAY_NE[s] | RAY_NW[s] | RAY_SE[s] | RAY_SW[s] for s in range(64)]
+
+
+def rook_attacks(sq, occ):
+    a = RAY_N[sq]
+    b = a & occ
+    if b:
+        a ^= RAY_N[(b & -b).bit_length() - 1]
+    r = RAY_E[sq]
+    b = r & occ
+    if b:
+        r ^= RAY_E[(b & -b).bit_length() - 1]
+    a |= r
+    r = RAY_S[sq]
+    b = r & occ
+    if b:
+        r ^= RAY_S[b.bit_length() - 1]
+    a |= r
+    r = RAY_W[sq]
+    b = r & occ
+    if b:
+        r ^= RAY_W[b.bit_length() - 1]
+    return a | r
+
+
+def bishop_attacks(sq, occ):
+    a = RAY_NE[sq]
+    b = a & occ
+    if b:
+        a ^= RAY_NE[(b & -b).bit_length() - 1]
+    r = RAY_NW[sq]
+    b = r & occ
+    if b:
+        r ^= RAY_NW[(b & -b).bit_length() - 1]
+    a |= r
+    r = RAY_SE[sq]
+    b = r & occ
+    if b:
+        r ^= RAY_SE[b.bit_length() - 1]
+    a |= r
+    r = RAY_SW[sq]
+    b = r & occ
+    if b:
+        r ^= RAY_SW[b.bit_length() - 1]
+    return a | r
+
+
+# Castling bookkeeping: rights kept after a move touches a square, and the
+# rook move that accompanies each king destination.
+CASTLE_MASK = [15] * 64
+CASTLE_MASK[0], CASTLE_MASK[4], CASTLE_MASK[7] = 15 ^ WQ, 15 ^ (WK | WQ), 15 ^ WK
+CASTLE_MASK[56], CASTLE_MASK[60], CASTLE_MASK[63] = 15 ^ BQ, 15 ^ (BK | BQ), 15 ^ BK
+CASTLE_ROOK = {6: (7, 5), 2: (0, 3), 62: (63, 61), 58: (56, 59)}
+
+
+# Zobrist keys: ZOBRIST_PIECE[piece * 64 + sq], castling rights, ep file, side
+_rng = Random(0x5EED)
+ZOBRIST_PIECE = [_rng.getrandbits(64) for _ in range(12 * 64)]
+ZOBRIST_CASTLE = [_rng.getrandbits(64) for _ in range(16)]
+ZOBRIST_EP = [_rng.getrandbits(64) for _ in range(8)]
+ZOBRIST_SIDE = _rng.getrandbits(64)
+del _rng
+
+
+def move_from(move):
+    return move & 63
+
+
+def move_to(move):
+    return (move >> 6) & 63
+
+
+def move_flag(move):
+    return move >> 14
+
+
+def move_promo(move):
+    """Promotion piece type of a move, or None."""
+    return KNIGHT + ((move >> 12) & 3) if move >> 14 == PROMOTION else None
+
+
+def encode_move(fr, to, flag=NORMAL, promo=KNIGHT):
+    return fr | (to << 6) | ((promo - KNIGHT) << 12) | (flag << 14)
+
+
+def move_to_uci(move):
+    uci = square_name(move & 63) + square_name((move >> 6) & 63)
+    if move >> 14 == PROMOTION:
+        uci += PROMO_SYMBOLS[(move >> 12) & 3]
+    return uci
+
+
+class Position:
+    """Mutable chess position. Build once, then make/unmake moves in place."""
+
+    def __init__(self, fen=START_FEN):
+        self.set_fen(fen)
+
+    # --- FEN -------------------------------------------------------------
+
+    def set_fen(self, fen):
+        parts = fen.split()
+        self.bb = [0] * 12
+        self.occupied = [0, 0]
+        self.squares = [EMPTY] * 64
+        self.history = []
+        rank, file = 7, 0
+        for ch in parts[0]:
+            if ch == '/':
+                rank, file = rank - 1, 0
+            elif ch.isdigit():
+                file += int(ch)
+            else:
+                piece = PIECE_SYMBOLS.index(ch)
+                sq = rank * 8 + file
+                self.squares[sq] = piece
+                self.bb[piece] |= 1 << sq
+                self.occupied[piece // 6] |= 1 << sq
+                file += 1
+        self.side = WHITE if len(parts) < 2 or parts[1] == 'w' else BLACK
+        castling = parts[2] if len(parts) > 2 else '-'
+        self.castling = sum(bit for ch, bit in zip('KQkq', (WK, WQ, BK, BQ)) if ch in castling)
+        ep = parse_square(parts[3]) if len(parts) > 3 and parts[3] != '-' else -1
+        if ep >= 0 and not PAWN_ATTACKS[self.side ^ 1][ep] & self.bb[self.side * 6 + PAWN]:
+            ep = -1
+        self.ep = ep
+        self.halfmove = int(parts[4]) if len(parts) > 4 else 0
+        self.fullmove = int(parts[5]) if len(parts) > 5 else 1
+        self.key = self.compute_key()
+        self.pawn_key = self.compute_pawn_key()
+        self.mg, self.eg, self.phase = self.compute_eval()
+
+    def compute_eval(self):
+        """(mg, eg, phase) computed from scratch (make/unmake update them incrementally)."""
+        mg = eg = phase = 0
+        for sq, piece in enumerate(self.squares):
+            if piece != EMPTY:
+                mg += PST_MG[piece * 64 + sq]
+                eg += PST_EG[piece * 64 + sq]
+                phase += PHASE_WEIGHTS[piece]
+        return mg, eg, phase
+
+    def compute_pawn_key(self):
+        """Zobrist key of the pawns alone, for the pawn hash (kept incrementally too)."""
+        key = 0
+        for piece in (PAWN, PAWN + 6):
+            pawns = self.bb[piece]
+            while pawns:
+                low = pawns & -pawns
+                pawns ^= low
+                key ^= ZOBRIST_PIECE[piece * 64 + low.bit_length() - 1]
+        return key
+
+    def compute_key(self):
+        """Zobrist key computed from scratch (make/unmake update it incrementally)."""
+        key = ZOBRIST_CASTLE[self.castling]
+        for sq, piece in enumerate(self.squares):
+            if piece != EMPTY:
+                key ^= ZOBRIST_PIECE[piece * 64 + sq]
+        if self.ep >= 0:
+            key ^= ZOBRIST_EP[self.ep & 7]
+        if self.side == BLACK:
+            key ^= ZOBRIST_SIDE
+        return key
+
+    def fen(self):
+        rows = []
+        for rank in range(7, -1, -1):
+            row, empty = '', 0
+            for file in range(8):
+                piece = self.squares[rank * 8 + file]
+                if piece == EMPTY:
+                    empty += 1
+                    continue
+                if empty:
+                    row, empty = row + str(empty), 0
+                row += PIECE_SYMBOLS[piece]
+            rows.append(row + (str(empty) if empty else ''))
+        castling = ''.join(ch for ch, bit in zip('KQkq', (WK, WQ, BK, BQ))
+                           if self.castling & bit) or '-'
+        ep = square_name(self.ep) if self.ep >= 0 else '-'
+        return (f"{'/'.join(rows)} {'wb'[self.side]} {castling} {ep} "
+                f"{self.halfmove} {self.fullmove}")
+
+    # --- Attacks ---------------------------------------------------------
+
+    def king_square(self, color):
+        return self.bb[color * 6 + KING].bit_length() - 1
+
+    def is_attacked(self, sq, by):
+        """True if `sq` is attacked by any piece of color `by`."""
+        bb = self.bb
+        base = by * 6
+        if KNIGHT_ATTACKS[sq] & bb[base + KNIGHT]:
+            return True
+        if PAWN_ATTACKS[by ^ 1][sq] & bb[base + PAWN]:
+            return True
+        if KING_ATTACKS[sq] & bb[base + KING]:
+            return True
+        occ = self.occupied[0] | self.occupied[1]
+        queens = bb[base + QUEEN]
+        diag = bb[base + BISHOP] | queens
+        if diag & BISHOP_MASK[sq] and bishop_attacks(sq, occ) & diag:
+            return True
+        line = bb[base + ROOK] | queens
+        if line & ROOK_MASK[sq] and rook_attacks(sq, occ) & line:
+            return True
+        return False
+
+    def attackers_to(self, sq, occ):
+        """Bitboard of pieces of both colors attacking `sq` given occupancy `occ`."""
+        bb = self.bb
+        diag = bb[BISHOP] | bb[QUEEN] | bb[BISHOP + 6] | bb[QUEEN + 6]
+        line = bb[ROOK] | bb[QUEEN] | bb[ROOK + 6] | bb[QUEEN + 6]
+        return ((PAWN_ATTACKS[BLACK][sq] & bb[PAWN])
+                | (PAWN_ATTACKS[WHITE][sq] & bb[PAWN + 6])
+                | (KNIGHT_ATTACKS[sq] & (bb[KNIGHT] | bb[KNIGHT + 6]))
+                | (KING_ATTACKS[sq] & (bb[KING] | bb[KING + 6]))
+                | (bishop_attacks(sq, occ) & diag)
+                | (rook_attacks(sq, occ) & line))
+
+    def in_check(self):
+        return self.is_attacked(self.king_square(self.side), self.side ^ 1)
+
+    def is_repetition(self):
+        """True if the current position occurred before since the last irreversible move."""
+        key = self.key
+        history = self.history
+        stop = max(len(history) - self.halfmove, 0)
+        for i in range(len(history) - 2, stop - 1, -2):
+            if history[i][5] == key:
+                return True
+        return False
+
+    # --- Move generation -------------------------------------------------
+
+    def gen_noisy(self, moves):
+        """Append pseudo-legal captures and queen promotions to `moves`."""
+        us = self.side
+        them = us ^ 1
+        bb = self.bb
+        base = us * 6
+        enemy = self.occupied[them]
+        occ = self.occupied[us] | enemy
+        append = moves.append
+
+        pawns = bb[base + PAWN]
+        if us == WHITE:
+            left = (pawns << 7) & enemy & NOT_FILE_H
+            right = (pawns << 9) & enemy & NOT_FILE_A
+            push = (pawns << 8) & RANK_8 & ~occ
+            dl, dr, dp = 7, 9, 8
+        else:
+            left = (pawns >> 9) & enemy & NOT_FILE_H
+            right = (pawns >> 7) & enemy & NOT_FILE_A
+            push = (pawns >> 8) & RANK_1 & ~occ
+            dl, dr, dp = -9, -7, -8
+        promo_rank = RANK_8 | RANK_1
+        for targets, delta in ((left, dl), (right, dr), (push, dp)):
+            while targets:
+                low = targets & -targets
+                to = low.bit_length() - 1
+                targets ^= low
+                fr = to - delta
+                if low & promo_rank:
+                    append(fr | (to << 6) | 0x7000)  # PROMOTION to queen
+                else:
+                    append(fr | (to << 6))
+        if self.ep >= 0:
+            attackers = PAWN_ATTACKS[them][self.ep] & pawns
+            while attackers:
+                low = attackers & -attackers
+                attackers ^= low
+                append((low.bit_length() - 1) | (self.ep << 6) | 0x8000)
+
+        self._gen_pieces(moves, enemy, occ)
+
+    def gen_quiet(self, moves):
+        """Append pseudo-legal non-captures, under-promotions and castling."""
+        us = self.side
+        them = us ^ 1
+        bb = self.bb
+        base = us * 6
+        enemy = self.occupied[them]
+        occ = self.occupied[us] | enemy
+        empty = FULL ^ occ
+        append = moves.append
+
+        pawns = bb[base + PAWN]
+        if us == WHITE:
+            single = (pawns << 8) & empty
+            double = ((single & RANK_3) << 8) & empty
+            left = (pawns << 7) & enemy & NOT_FILE_H & RANK_8
+            right = (pawns << 9) & enemy & NOT_FILE_A & RANK_8
+            dl, dr, dp = 7, 9, 8
+        else:
+            single = (pawns >> 8) & empty
+            double = ((single & RANK_6) >> 8) & empty
+            left = (pawns >> 9) & enemy & NOT_FILE_H & RANK_1
+            right = (pawns >> 7) & enemy & NOT_FILE_A & RANK_1
+            dl, dr, dp = -9, -7, -8
+        promo_rank = RANK_8 | RANK_1
+        for targets, delta in ((single, dp), (left, dl), (right, dr)):
+            while targets:
+                low = targets & -targets
+                to = low.bit_length() - 1
+                targets ^= low
+                move = (to - delta) | (to << 6)
+                if low & promo_rank:
+                    append(move | 0x4000)  # knight
+                    append(move | 0x5000)  # bishop
+                    append(move | 0x6000)  # rook
+                elif delta == dp:
+                    append(move)
+        while double:
+            low = double & -double
+            to = low.bit_length() - 1
+            double ^= low
+            append((to - 2 * dp) | (to << 6))
+
+        self._gen_pieces(moves, empty, occ)
+
+        if self.castling:
+            if us == WHITE:
+                if (self.castling & WK and not occ & 0x60
+                        and not self.is_attacked(4, them) and not self.is_attacked(5, them)
+                        and not self.is_attacked(6, them)):
+                    append(4 | (6 << 6) | 0xC000)
+                if (self.castling & WQ and not occ & 0x0E
+                        and not self.is_attacked(4, them) and not self.is_attacked(3, them)
+                        and not self.is_attacked(2, them)):
+                    append(4 | (2 << 6) | 0xC000)
+            else:
+                if (self.castling & BK and not occ & (0x60 << 56)
+                        and not self.is_attacked(60, them) and not self.is_attacked(61, them)
+                        and not self.is_attacked(62, them)):
+                    append(60 | (62 << 6) | 0xC000)
+                if (self.castling & BQ and not occ & (0x0E << 56)
+                        and not self.is_attacked(60, them) and not self.is_attacked(59, them)
+                        and not self.is_attacked(58, them)):
+                    append(60 | (58 << 6) | 0xC000)
+
+    def _gen_pieces(self, moves, targets, occ):
+        """Append knight, bishop, rook, queen and king moves onto `targets`."""
+        bb = self.bb
+        base = self.side * 6
+        append = moves.append
+        for pt in (KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            pieces = bb[base + pt]
+            while pieces:
+                low = pieces & -pieces
+                fr = low.bit_length() - 1
+                pieces ^= low
+                if pt == KNIGHT:
+                    att = KNIGHT_ATTACKS[fr] & targets
+                elif pt == BISHOP:
+                    att = bishop_attacks(fr, occ) & targets
+                elif pt == ROOK:
+                    att = rook_attacks(fr, occ) & targets
+                elif pt == QUEEN:
+                    att = (bishop_attacks(fr, occ) | rook_attacks(fr, occ)) & targets
+                else:
+                    att = KING_ATTACKS[fr] & targets
+                while att:
+                    low = att & -att
+                    att ^= low
+                    append(fr | ((low.bit_length() - 1) << 6))
+
+    def is_pseudo_legal(self, move):
+        """
+        True if `move` is among this position's pseudo-legal moves. Lets
+        moves remembered from elsewhere (TT, killers) be tried before any
+        generation.
+        """
+        fr, to, flag = move & 63, (move >> 6) & 63, move >> 14
+        squares = self.squares
+        us = self.side
+        piece = squares[fr]
+        if piece == EMPTY or piece // 6 != us:
+            return False
+        target = squares[to]
+        if target != EMPTY and (target // 6 == us or target % 6 == KING):
+            return False
+        pt = piece % 6
+        if flag == CASTLING:
+            moves = []
+            self.gen_quiet(moves)
+            return move in moves
+        if pt == PAWN:
+            if (flag == PROMOTION) != bool((RANK_8 | RANK_1) >> to & 1):
+                return False
+            if flag == EN_PASSANT:
+                return to == self.ep and bool(PAWN_ATTACKS[us][fr] >> to & 1)
+            if PAWN_ATTACKS[us][fr] >> to & 1:
+                return target != EMPTY
+            step = 8 if us == WHITE else -8
+            if to == fr + step:
+                return target == EMPTY
+            return (to == fr + 2 * step and target == EMPTY and squares[fr + step] == EMPTY
+                    and bool((RANK_1 << 8 if us == WHITE else RANK_6 << 8) >> fr & 1))
+        if flag != NORMAL:
+            return False
+        occ = self.occupied[0] | self.occupied[1]
+        if pt == KNIGHT:
+            att = KNIGHT_ATTACKS[fr]
+        elif pt == BISHOP:
+            att = bishop_attacks(fr, occ)
+        elif pt == ROOK:
+            att = rook_attacks(fr, occ)
+        elif pt == QUEEN:
+            att = bishop_attacks(fr, occ) | rook_attacks(fr, occ)
+        else:
+            att = KING_ATTACKS[fr]
+        return bool(att >> to & 1)
+
+    def pseudo_legal_moves(self):
+        moves = []
+        self.gen_noisy(moves)
+        self.gen_quiet(moves)
+        return moves
+
+    def _legal(self, moves):
+        legal = []
+        for move in moves:
+            if self.make(move):
+                self.unmake()
+                legal.append(move)
+        return legal
+
+    def legal_moves(self):
+        return self._legal(self.pseudo_legal_moves())
+
+    def legal_noisy(self, moves=None):
+        """
+        Legal captures and queen promotions, without generating quiet moves;
+        filtered from `moves` when the caller already ran gen_noisy().
+        """
+        if moves is None:
+            moves = []
+            self.gen_noisy(moves)
+        return self._legal(moves)
+
+    def legal_quiet(self, moves=None):
+        """Legal quiet moves, under-promotions and castling; from `moves` as for legal_noisy()."""
+        if moves is None:
+            moves = []
+            self.gen_quiet(moves)
+        return self._legal(moves)
+
+    def has_legal_move(self):
+        """Any legal move; quiet moves are only generated when no capture is legal."""
+        for generate in (self.gen_noisy, self.gen_quiet):
+            moves = []
+            generate(moves)
+            for move in moves:
+                if self.make(move):
+                    self.unmake()
+                    return True
+        return False
+
+    def is_checkmate(self):
+        return self.in_check() and not self.has_legal_move()
+
+    def is_stalemate(self):
+        return not self.in_check() and not self.has_legal_move()
+
+    # --- Make / unmake ---------------------------------------------------
+
+    def make(self, move):
+        """
+        Play `move` in place. Returns False (leaving the position unchanged)
+        if the move would leave the mover's own king in check.
+        """
+        fr = move & 63
+        to = (move >> 6) & 63
+        flag = move >> 14
+        us = self.side
+        them = us ^ 1
+        bb = self.bb
+        sq = self.squares
+        occupied = self.occupied
+        piece = sq[fr]
+        captured = sq[to]
+
+        castling = self.castling
+        key = self.key
+        pawn_key = self.pawn_key
+        mg, eg = self.mg, self.eg
+        self.history.append((move, captured, castling, self.ep, self.halfmove, key,
+                             mg, eg, self.phase, pawn_key))
+
+        i, j = piece * 64 + fr, piece * 64 + to
+        key ^= ZOBRIST_SIDE ^ ZOBRIST_PIECE[i] ^ ZOBRIST_PIECE[j]
+        mg += PST_MG[j] - PST_MG[i]
+        eg += PST_EG[j] - PST_EG[i]
+        if piece % 6 == PAWN:
+            pawn_key ^= ZOBRIST_PIECE[i] ^ ZOBRIST_PIECE[j]
+        if self.ep >= 0:
+            key ^= ZOBRIST_EP[self.ep & 7]
+        frto = (1 << fr) | (1 << to)
+        bb[piece] ^= frto
+        occupied[us] ^= frto
+        sq[fr] = EMPTY
+        sq[to] = piece
+        if captured != EMPTY:
+            bb[captured] ^= 1 << to
+            occupied[them] ^= 1 << to
+            i = captured * 64 + to
+            key ^= ZOBRIST_PIECE[i]
+            mg -= PST_MG[i]
+            eg -= PST_EG[i]
+            self.phase -= PHASE_WEIGHTS[captured]
+            if captured % 6 == PAWN:
+                pawn_key ^= ZOBRIST_PIECE[i]
+            self.halfmove = 0
+        elif piece % 6 == PAWN:
+            self.halfmove = 0
+        else:
+            self.halfmove += 1
+
+        if flag:
+            if flag == PROMOTION:
+                promoted = us * 6 + KNIGHT + ((move >> 12) & 3)
+                bb[piece] ^= 1 << to
+                bb[promoted] |= 1 << to
+                sq[to] = promoted
+                i = promoted * 64 + to
+                key ^= ZOBRIST_PIECE[j] ^ ZOBRIST_PIECE[i]
+                pawn_key ^= ZOBRIST_PIECE[j]
+                mg += PST_MG[i] - PST_MG[j]
+                eg += PST_EG[i] - PST_EG[j]
+                self.phase += PHASE_WEIGHTS[promoted]
+            elif flag == EN_PASSANT:
+                cap_sq = to - 8 if us == WHITE else to + 8
+                bb[them * 6 + PAWN] ^= 1 << cap_sq
+                occupied[them] ^= 1 << cap_sq
+                sq[cap_sq] = EMPTY
+                i = (them * 6 + PAWN) * 64 + cap_sq
+                key ^= ZOBRIST_PIECE[i]
+                pawn_key ^= ZOBRIST_PIECE[i]
+                mg -= PST_MG[i]
+                eg -= PST_EG[i]
+            else:
+                rook_fr, rook_to = CASTLE_ROOK[to]
+                rook = sq[rook_fr]
+                mask = (1 << rook_fr) | (1 << rook_to)
+                bb[rook] ^= mask
+                occupied[us] ^= mask
+                sq[rook_fr] = EMPTY
+                sq[rook_to] = rook
+                i, j = rook * 64 + rook_fr, rook * 64 + rook_to
+                key ^= ZOBRIST_PIECE[i] ^ ZOBRIST_PIECE[j]
+                mg += PST_MG[j] - PST_MG[i]
+                eg += PST_EG[j] - PST_EG[i]
+
+        self.castling = castling & CASTLE_MASK[fr] & CASTLE_MASK[to]
+        if self.castling != castling:
+            key ^= ZOBRIST_CASTLE[castling] ^ ZOBRIST_CASTLE[self.castling]
+        self.ep = -1
+        if piece % 6 == PAWN and (to - fr == 16 or fr - to == 16):
+            ep = (fr + to) >> 1
+            if PAWN_ATTACKS[us][ep] & bb[them * 6 + PAWN]:
+                self.ep = ep
+                key ^= ZOBRIST_EP[ep & 7]
+        self.key = key
+        self.pawn_key = pawn_key
+        self.mg, self.eg = mg, eg
+        if us == BLACK:
+            self.fullmove += 1
+        self.side = them
+
+        if self.is_attacked(bb[us * 6 + KING].bit_length() - 1, them):
+            self.unmake()
+            return False
+        return True
+
+    def unmake(self):
+        (move, captured, self.castling, self.ep, self.halfmove, self.key,
+         self.mg, self.eg, self.phase, self.pawn_key) = self.history.pop()
+        fr = move & 63
+        to = (move >> 6) & 63
+        flag = move >> 14
+        them = self.side
+        us = them ^ 1
+        self.side = us
+        if us == BLACK:
+            self.fullmove -= 1
+        bb = self.bb
+        sq = self.squares
+        occupied = self.occupied
+
+        piece = sq[to]
+        if flag == PROMOTION:
+            bb[piece] ^= 1 << to
+            piece = us * 6 + PAWN
+            bb[piece] |= 1 << to
+        frto = (1 << fr) | (1 << to)
+        bb[piece] ^= frto
+        occupied[us] ^= frto
+        sq[fr] = piece
+        sq[to] = captured
+        if captured != EMPTY:
+            bb[captured] |= 1 << to
+            occupied[them] |= 1 << to
+        if flag == EN_PASSANT:
+            cap_sq = to - 8 if us == WHITE else to + 8
+            bb[them * 6 + PAWN] |= 1 << cap_sq
+            occupied[them] |= 1 << cap_sq
+            sq[cap_sq] = them * 6 + PAWN
+        elif flag == CASTLING:
+            rook_fr, rook_to = CASTLE_ROOK[to]
+            rook = sq[rook_to]
+            mask = (1 << rook_fr) | (1 << rook_to)
+            bb[rook] ^= mask
+            occupied[us] ^= mask
+            sq[rook_to] = EMPTY
+            sq[rook_fr] = rook
+
+    # --- UCI -------------------------------------------------------------
+
+    def parse_uci(self, uci):
+        """Encode a UCI move string for this position (legality not checked)."""
+        fr, to = parse_square(uci[0:2]), parse_square(uci[2:4])
+        piece = self.squares[fr] % 6
+        if len(uci) > 4:
+            return encode_move(fr, to, PROMOTION, KNIGHT + PROMO_SYMBOLS.index(uci[4].lower()))
+        if piece == PAWN and to == self.ep:
+            return encode_move(fr, to, EN_PASSANT)
+        if piece == KING and abs(to - fr) == 2:
+            return encode_move(fr, to, CASTLING)
+        return encode_move(fr, to)
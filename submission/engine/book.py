@@ -0,0 +1,73 @@
+# submission/engine/book.py
+"""
+Opening book stored as one sorted `bytes` blob of 12-byte records:
+64-bit Zobrist key, 16-bit move and 16-bit weight (big-endian). Lookups
+bisect the blob directly, so the book costs no memory beyond its bytes.
+"""
+import os
+import random
+from struct import Struct
+
+RECORD = Struct('>QHH')
+BOOK_PATH = os.path.join(os.path.dirname(__file__), 'book.bin')
+DEFAULT_MAX_BYTES = 12 * 1024
+
+
+class OpeningBook:
+    def __init__(self, blob=None, path=BOOK_PATH):
+        if blob is None:
+            try:
+                with open(path, 'rb') as f:
+                    blob = f.read()
+            except OSError:
+                blob = b''
+        self.blob = blob
+        self.size = len(blob) // RECORD.size
+
+    def lookup(self, key):
+        """All (move, weight) pairs stored for `key`, heaviest first."""
+        blob = self.blob
+        unpack_from = RECORD.unpack_from
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            if unpack_from(blob, mid * RECORD.size)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        entries = []
+        while lo < self.size:
+            k, move, weight = unpack_from(blob, lo * RECORD.size)
+            if k != key:
+                break
+            entries.append((move, weight))
+            lo += 1
+        return entries
+
+    def choose(self, pos, rng=random):
+        """A weighted-random legal book move for `pos`, or None when out of book."""
+        entries = self.lookup(pos.key)
+        if not entries:
+            return None
+        legal = pos.legal_moves()
+        entries = [(move, weight) for move, weight in entries if move in legal]
+        if not entries:
+            return None
+        pick = rng.uniform(0, sum(weight for _, weight in entries))
+        for move, weight in entries:
+            pick -= weight
+            if pick <= 0:
+                return move
+        return entries[0][0]
+
+
+def build_book(weights, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Serialise {(key, move): weight} into a book blob of at most `max_bytes`,
+    dropping the lightest entries first when the cap is hit.
+    """
+    entries = sorted(weights.items(), key=lambda item: -item[1])
+    entries = entries[:max_bytes // RECORD.size]
+    entries.sort(key=lambda item: (item[0][0], -item[1]))
+    return b''.join(RECORD.pack(key, move, min(weight, 0xFFFF))
+                    for (key, move), weight in entries)
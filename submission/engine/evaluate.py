@@ -0,0 +1,35 @@
+# submission/engine/evaluate.py
+"""Static evaluation in centipawns from the side to move's point of view."""
+from .board import WHITE, BLACK, ROOK
+from .pawns import pawn_table
+from .pst import MAX_PHASE
+
+# Rook on a file without pawns / without own pawns
+ROOK_OPEN_MG, ROOK_OPEN_EG = 20, 10
+ROOK_SEMI_OPEN_MG, ROOK_SEMI_OPEN_EG = 10, 5
+
+
+def evaluate(pos):
+    """
+    Tapered material + piece-square score, maintained incrementally by
+    Position, plus pawn structure and rook files from the pawn hash.
+    """
+    pawn_mg, pawn_eg, open_files, semi_white, semi_black = pawn_table.probe(pos)
+    mg = pos.mg + pawn_mg
+    eg = pos.eg + pawn_eg
+    for color, semi, sign in ((WHITE, semi_white, 1), (BLACK, semi_black, -1)):
+        rooks = pos.bb[color * 6 + ROOK]
+        while rooks:
+            low = rooks & -rooks
+            rooks ^= low
+            f = (low.bit_length() - 1) & 7
+            if open_files >> f & 1:
+                mg += sign * ROOK_OPEN_MG
+                eg += sign * ROOK_OPEN_EG
+            elif semi >> f & 1:
+                mg += sign * ROOK_SEMI_OPEN_MG
+                eg += sign * ROOK_SEMI_OPEN_EG
+    phase = pos.phase if pos.phase < MAX_PHASE else MAX_PHASE
+    score = mg * phase + eg * (MAX_PHASE - phase)
+    # Round from the side to move's view so both colors see the same score
+    return (score if pos.side == WHITE else -score) // MAX_PHASE
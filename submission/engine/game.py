@@ -0,0 +1,87 @@
+# submission/engine/game.py
+"""Engine state kept between agent calls within one game."""
+from array import array
+
+from .board import Position, NO_MOVE
+from .book import OpeningBook
+from .mate import find_mate_in_one, find_mate_in_two
+from .search import Searcher, MATE
+
+
+class GameState:
+    """
+    Holds the game position (with its move history for repetition
+    detection), the searcher with its transposition table and the last
+    principal variation, plus the opening book. `sync()` brings it up to date with the board the
+    environment sends, replaying the opponent's move incrementally when it
+    can find it and starting over otherwise.
+    """
+
+    def __init__(self, searcher=None, book=None):
+        self.searcher = searcher if searcher is not None else Searcher()
+        self.book = book if book is not None else OpeningBook()
+        self.pos = None
+        self.pv = array('H')
+        self.opponent_move = NO_MOVE
+        self.games = 0
+
+    def reset(self, target):
+        self.pos = target
+        self.pv = array('H')
+        self.opponent_move = NO_MOVE
+        self.searcher.tt.clear()
+        self.games += 1
+
+    def sync(self, fen):
+        """Return the game Position for `fen`, reusing the previous one when possible."""
+        target = Position(fen)
+        pos = self.pos
+        self.opponent_move = NO_MOVE
+        if pos is None:
+            self.reset(target)
+            return target
+        if pos.key != target.key:
+            for move in pos.legal_moves():
+                pos.make(move)
+                if pos.key == target.key:
+                    self.opponent_move = move
+                    break
+                pos.unmake()
+            else:
+                # New game or a position we did not come from
+                self.reset(target)
+                return target
+        # The environment's counters are authoritative; positions before the
+        # last irreversible move can never repeat, so drop their undo records.
+        pos.halfmove, pos.fullmove = target.halfmove, target.fullmove
+        del pos.history[:max(0, len(pos.history) - pos.halfmove)]
+        return pos
+
+    def expected_move(self):
+        """Our PV move for this position if the opponent played the predicted reply."""
+        pv = self.pv
+        if len(pv) >= 3 and self.opponent_move and pv[1] == self.opponent_move:
+            return pv[2]
+        return NO_MOVE
+
+    def play(self, fen, time_limit, soft_limit=None):
+        """Sync to `fen`, search it and play the chosen move on the game position."""
+        pos = self.sync(fen)
+        move, score = self.book.choose(pos), 0
+        if not move:
+            # Scored like the search scores mates: MATE less the plies to mate
+            moves = pos.pseudo_legal_moves()
+            move, score = find_mate_in_one(pos, moves), MATE - 1
+            if not move:
+                move, score = find_mate_in_two(pos, moves=moves), MATE - 3
+        if move:
+            # Book moves and forced mates cost no search time
+            self.pv = array('H')
+            pos.make(move)
+            return move, score, 0
+        move, score, depth = self.searcher.search(pos, time_limit, hint=self.expected_move(),
+                                                  soft_limit=soft_limit)
+        self.pv = self.searcher.pv
+        if move:
+            pos.make(move)
+        return move, score, depth
@@ -0,0 +1,132 @@
+# submission/engine/mate.py
+"""
+Forced-mate detection. Only checking moves can mate, so candidates are
+filtered with attack maps around the enemy king before any move is
+made: a piece landing on a square that attacks the king, or a piece
+stepping off the line between the king and one of our sliders.
+"""
+from .board import (
+    NO_MOVE, PROMOTION, EN_PASSANT, CASTLING, BISHOP, ROOK, QUEEN,
+    KNIGHT_ATTACKS, PAWN_ATTACKS, BISHOP_MASK, ROOK_MASK, bishop_attacks, rook_attacks,
+)
+
+# Upper bound on defender replies examined by one mate-in-2 probe
+MATE2_NODES = 200
+
+
+def check_candidates(pos, moves):
+    """
+    The moves in `moves` that may give check: a superset of the checking
+    moves, to be confirmed by making them.
+    """
+    us = pos.side
+    them = us ^ 1
+    bb = pos.bb
+    base = us * 6
+    ksq = pos.king_square(them)
+    occ = pos.occupied[0] | pos.occupied[1]
+    diag = bishop_attacks(ksq, occ)
+    line = rook_attacks(ksq, occ)
+    # Squares from which each piece type of ours attacks the enemy king
+    targets = [PAWN_ATTACKS[them][ksq], KNIGHT_ATTACKS[ksq], diag, line, diag | line, 0]
+
+    # Our pieces shielding the king from one of our own sliders
+    shields = 0
+    own = pos.occupied[us]
+    sliders = bb[base + BISHOP] | bb[base + QUEEN]
+    if sliders & BISHOP_MASK[ksq]:
+        for blocker in _bits(diag & own):
+            if bishop_attacks(ksq, occ ^ blocker) & sliders & ~diag:
+                shields |= blocker
+    sliders = bb[base + ROOK] | bb[base + QUEEN]
+    if sliders & ROOK_MASK[ksq]:
+        for blocker in _bits(line & own):
+            if rook_attacks(ksq, occ ^ blocker) & sliders & ~line:
+                shields |= blocker
+
+    squares = pos.squares
+    candidates = []
+    for move in moves:
+        fr = move & 63
+        flag = move >> 14
+        if (flag == EN_PASSANT or flag == CASTLING or flag == PROMOTION
+                or shields >> fr & 1
+                or targets[squares[fr] % 6] >> ((move >> 6) & 63) & 1):
+            candidates.append(move)
+    return candidates
+
+
+def _bits(b):
+    while b:
+        low = b & -b
+        b ^= low
+        yield low
+
+
+def checking_moves(pos, moves=None):
+    """Legal moves of `pos` (or of `moves`) that give check."""
+    if moves is None:
+        moves = pos.pseudo_legal_moves()
+    checks = []
+    for move in check_candidates(pos, moves):
+        if pos.make(move):
+            if pos.in_check():
+                checks.append(move)
+            pos.unmake()
+    return checks
+
+
+def find_mate_in_one(pos, moves=None):
+    """A move that mates at once, or NO_MOVE. Every legal move is covered."""
+    if moves is None:
+        moves = pos.pseudo_legal_moves()
+    for move in check_candidates(pos, moves):
+        if pos.make(move):
+            mate = pos.in_check() and not pos.has_legal_move()
+            pos.unmake()
+            if mate:
+                return move
+    return NO_MOVE
+
+
+def find_mate_in_two(pos, max_nodes=MATE2_NODES, moves=None):
+    """
+    A checking move (of `moves`, if given) after which every reply allows
+    mate in one, or NO_MOVE. Quiet first moves are not tried, and the
+    probe gives up once `max_nodes` replies have been examined.
+    """
+    nodes = 0
+    for move in checking_moves(pos, moves):
+        pos.make(move)
+        forced = True
+        replied = False
+        for reply in pos.pseudo_legal_moves():
+            if not pos.make(reply):
+                continue
+            if nodes >= max_nodes:
+                # A reply is left unexamined, so nothing more can be proven
+                pos.unmake()
+                pos.unmake()
+                return NO_MOVE
+            replied = True
+            nodes += 1
+            mate = find_mate_in_one(pos)
+            pos.unmake()
+            if not mate:
+                forced = False
+                break
+        pos.unmake()
+        if forced and replied:
+            return move
+    return NO_MOVE
+
+
+def find_mate(pos, moves=None, max_nodes=MATE2_NODES):
+    """
+    Fast path for move pickers: a mate in one, else a mate in two by checks,
+    else NO_MOVE. `moves` are the pseudo-legal moves of `pos` if the caller
+    has them; both probes share the one list.
+    """
+    if moves is None:
+        moves = pos.pseudo_legal_moves()
+    return find_mate_in_one(pos, moves) or find_mate_in_two(pos, max_nodes, moves)
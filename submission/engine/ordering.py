@@ -0,0 +1,115 @@
+# submission/engine/ordering.py
+"""
+Move ordering: transposition-table move, captures that do not lose
+material (MVV-LVA), two killer moves per ply, remaining quiet moves by
+history score, and finally losing captures. Moves are produced stage by
+stage, so a cutoff in an early stage never pays for generating the
+quiet moves.
+"""
+from array import array
+
+from .board import NO_MOVE, NORMAL, PROMOTION, EN_PASSANT, CASTLING, EMPTY
+from .see import see_ge
+
+MAX_PLY = 128
+MAX_MOVES = 256  # more than the legal moves of any chess position
+HISTORY_LIMIT = 1 << 20  # halve the whole table once any entry gets this large
+
+# Victim values for MVV-LVA ordering, indexed by piece code (EMPTY last)
+MVV_VALUES = [1, 3, 3, 5, 9, 0] * 2 + [0]
+
+
+def mvv_lva(pos, move):
+    """Most valuable victim first, least valuable attacker as tie-break."""
+    squares = pos.squares
+    flag = move >> 14
+    score = MVV_VALUES[squares[(move >> 6) & 63]] * 16 - squares[move & 63] % 6
+    if flag == PROMOTION:
+        score += 128
+    elif flag == EN_PASSANT:
+        score += 16
+    return score
+
+
+def is_quiet(pos, move):
+    flag = move >> 14
+    return (flag == NORMAL or flag == CASTLING) and pos.squares[(move >> 6) & 63] == EMPTY
+
+
+class MoveOrderer:
+    """
+    Killer slots per ply and a [piece][to-square] history table in fixed
+    arrays, plus one preallocated move buffer per ply for the quiet moves
+    a node has tried, so the search keeps no per-node move lists alive.
+    """
+
+    def __init__(self):
+        self.killers = array('H', bytes(2 * 2 * MAX_PLY))
+        self.history = array('i', bytes(4 * 12 * 64))
+        self.tried = [array('H', bytes(2 * MAX_MOVES)) for _ in range(MAX_PLY)]
+
+    def new_search(self):
+        """Forget killers and age the history between moves."""
+        self.killers = array('H', bytes(2 * 2 * MAX_PLY))
+        history = self.history
+        for i in range(len(history)):
+            history[i] >>= 1
+
+    def staged(self, pos, tt_move, ply):
+        """
+        Yield the pseudo-legal moves of `pos`, best candidates first. The
+        position must be restored between moves, as negamax does.
+        """
+        if tt_move and pos.is_pseudo_legal(tt_move):
+            yield tt_move
+        else:
+            tt_move = NO_MOVE
+
+        noisy = []
+        pos.gen_noisy(noisy)
+        noisy.sort(key=lambda m: mvv_lva(pos, m), reverse=True)
+        bad = []
+        for move in noisy:
+            if move != tt_move:
+                if see_ge(pos, move):
+                    yield move
+                else:
+                    bad.append(move)
+
+        killers = ()
+        if ply < MAX_PLY:
+            killers = [k for k in self.killers[2 * ply:2 * ply + 2]
+                       if k and k != tt_move and is_quiet(pos, k) and pos.is_pseudo_legal(k)]
+            yield from killers
+
+        quiet = []
+        pos.gen_quiet(quiet)
+        history = self.history
+        squares = pos.squares
+        quiet.sort(key=lambda m: history[squares[m & 63] * 64 + ((m >> 6) & 63)], reverse=True)
+        for move in quiet:
+            if move != tt_move and move not in killers:
+                yield move
+        yield from bad
+
+    def order(self, pos, tt_move, ply):
+        """All pseudo-legal moves of `pos` as a list, in `staged()` order."""
+        return list(self.staged(pos, tt_move, ply))
+
+    def cutoff(self, pos, move, depth, ply, tried):
+        """Reward a quiet move that caused a beta cutoff and penalise the quiets tried before it."""
+        killers = self.killers
+        if ply < MAX_PLY and killers[2 * ply] != move:
+            killers[2 * ply + 1] = killers[2 * ply]
+            killers[2 * ply] = move
+        history = self.history
+        squares = pos.squares
+        bonus = depth * depth
+        for other in tried:
+            j = squares[other & 63] * 64 + ((other >> 6) & 63)
+            history[j] = max(history[j] - bonus, -HISTORY_LIMIT)
+        i = squares[move & 63] * 64 + ((move >> 6) & 63)
+        history[i] += bonus
+        if history[i] > HISTORY_LIMIT:
+            for j in range(len(history)):
+                history[j] >>= 1
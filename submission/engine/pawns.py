@@ -0,0 +1,130 @@
+# submission/engine/pawns.py
+"""
+Pawn-structure evaluation cached in a fixed-size pawn hash.
+
+Doubled, isolated and passed pawns and the open / semi-open files are
+computed from the two pawn bitboards, then stored under the position's
+pawn-only Zobrist key. Pawn structure changes on few moves, so nearly
+every probe is a hit. Each slot holds the full key and one packed word:
+
+    bits  0-15  middlegame score + SCORE_OFFSET (positive for White)
+    bits 16-31  endgame score + SCORE_OFFSET
+    bits 32-39  open files (no pawns at all), bit f for file f
+    bits 40-47  files without white pawns
+    bits 48-55  files without black pawns
+"""
+from array import array
+
+from .board import WHITE, BLACK, PAWN, FILE_A
+
+DEFAULT_SIZE = 1 << 16  # bytes
+SLOT_BYTES = 16
+SCORE_OFFSET = 1 << 15
+
+DOUBLED_MG, DOUBLED_EG = 10, 20  # per extra pawn on a file
+ISOLATED_MG, ISOLATED_EG = 10, 15
+# Passed pawn bonus by rank counted from the pawn's own side
+PASSED_MG = [0, 0, 5, 10, 20, 35, 50, 0]
+PASSED_EG = [0, 5, 10, 20, 35, 55, 80, 0]
+
+FILES = [FILE_A << f for f in range(8)]
+ADJACENT_FILES = [(FILES[f - 1] if f else 0) | (FILES[f + 1] if f < 7 else 0) for f in range(8)]
+
+
+def _front_span(color, sq, files):
+    """Squares ahead of `sq` for `color` on `files`."""
+    rank = sq >> 3
+    if color == WHITE:
+        return files & ~((1 << (8 * (rank + 1))) - 1)
+    return files & ((1 << (8 * rank)) - 1)
+
+
+# PASSED_SPAN[color][sq]: enemy pawns here stop a pawn on `sq` from being passed
+PASSED_SPAN = [[_front_span(color, sq, FILES[sq & 7] | ADJACENT_FILES[sq & 7]) for sq in range(64)]
+               for color in (WHITE, BLACK)]
+# FRONT_FILE[color][sq]: an own pawn here makes the pawn on `sq` the rear of a doubled pair
+FRONT_FILE = [[_front_span(color, sq, FILES[sq & 7]) for sq in range(64)] for color in (WHITE, BLACK)]
+
+
+def pawn_structure(white, black):
+    """(mg, eg, open, semi_open_white, semi_open_black) for two pawn bitboards."""
+    mg = eg = 0
+    for color, own, enemy, sign in ((WHITE, white, black, 1), (BLACK, black, white, -1)):
+        for f in range(8):
+            count = (own & FILES[f]).bit_count()
+            if not count:
+                continue
+            if count > 1:
+                mg -= sign * DOUBLED_MG * (count - 1)
+                eg -= sign * DOUBLED_EG * (count - 1)
+            if not own & ADJACENT_FILES[f]:
+                mg -= sign * ISOLATED_MG * count
+                eg -= sign * ISOLATED_EG * count
+        span = PASSED_SPAN[color]
+        front = FRONT_FILE[color]
+        pawns = own
+        while pawns:
+            low = pawns & -pawns
+            pawns ^= low
+            sq = low.bit_length() - 1
+            if not enemy & span[sq] and not own & front[sq]:
+                rank = sq >> 3 if color == WHITE else 7 - (sq >> 3)
+                mg += sign * PASSED_MG[rank]
+                eg += sign * PASSED_EG[rank]
+    semi_white = semi_black = 0
+    for f in range(8):
+        if not white & FILES[f]:
+            semi_white |= 1 << f
+        if not black & FILES[f]:
+            semi_black |= 1 << f
+    open_files = semi_white & semi_black
+    return mg, eg, open_files, semi_white, semi_black
+
+
+class PawnTable:
+    """Fixed-size, always-replace pawn hash."""
+
+    def __init__(self, size_bytes=DEFAULT_SIZE):
+        slots = 1
+        while slots * 2 * SLOT_BYTES <= size_bytes:
+            slots *= 2
+        self.mask = slots - 1
+        self.keys = array('Q', bytes(8 * slots))
+        self.data = array('Q', bytes(8 * slots))
+        self.reset_stats()
+
+    @property
+    def size_bytes(self):
+        return (self.keys.itemsize * len(self.keys)
+                + self.data.itemsize * len(self.data))
+
+    def probe(self, pos):
+        """(mg, eg, open, semi_open_white, semi_open_black) for the pawns of `pos`."""
+        self.probes += 1
+        key = pos.pawn_key
+        i = key & self.mask
+        d = self.data[i]
+        if d and self.keys[i] == key:
+            self.hits += 1
+            return ((d & 0xFFFF) - SCORE_OFFSET, ((d >> 16) & 0xFFFF) - SCORE_OFFSET,
+                    (d >> 32) & 0xFF, (d >> 40) & 0xFF, (d >> 48) & 0xFF)
+        entry = pawn_structure(pos.bb[PAWN], pos.bb[BLACK * 6 + PAWN])
+        mg, eg, open_files, semi_white, semi_black = entry
+        self.keys[i] = key
+        self.data[i] = ((mg + SCORE_OFFSET) | ((eg + SCORE_OFFSET) << 16) | (open_files << 32)
+                        | (semi_white << 40) | (semi_black << 48))
+        return entry
+
+    def reset_stats(self):
+        self.probes = self.hits = 0
+
+    def stats(self):
+        return {
+            'size_bytes': self.size_bytes,
+            'probes': self.probes,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+        }
+
+
+# Shared by evaluate() and the rule-based bots
+pawn_table = PawnTable()
@@ -0,0 +1,307 @@
+# submission/engine/search.py
+"""Iterative-deepening negamax alpha-beta search with a hard deadline."""
+from array import array
+from time import perf_counter
+
+from .bitbase import probe as probe_bitbase
+from .board import NO_MOVE, NORMAL
+from .evaluate import evaluate
+from .pst import PIECE_VALUES
+from .ordering import MoveOrderer, mvv_lva, is_quiet
+from .see import see_ge
+from .tt import TranspositionTable, EXACT, LOWER, UPPER
+
+INF = 1000000
+MATE = 100000
+MATE_BOUND = MATE - 1000  # scores beyond this are forced mates
+KNOWN_WIN = 20000  # bitbase win with no distance to mate attached
+MAX_DEPTH = 64
+MAX_PLY = 96
+CHECK_EVERY = 255  # nodes between deadline checks (mask)
+
+# Soft-limit extension when the root is unstable: the best move changed or
+# the score fell by more than FAIL_LOW_MARGIN since the previous iteration
+UNSTABLE_EXTENSION = 1.5
+FAIL_LOW_MARGIN = 30
+
+# Growth of the iteration time per extra depth, used to predict whether the
+# next iteration ends in time: measured over the last two
+# iterations (odd and even depths grow unevenly) and kept within these bounds
+GROWTH = 4.0  # before there are two iterations to measure
+MIN_GROWTH = 2.0
+MAX_GROWTH = 8.0
+# How far past the soft limit a new depth may be expected to end
+SOFT_OVERRUN = 2.0
+
+# Quiescence: skip captures that cannot lift the score back to alpha
+DELTA_MARGIN = 200
+CAPTURE_GAIN = PIECE_VALUES * 2 + [0]
+
+
+def predicted_cost(times):
+    """Expected seconds for the next depth, given the times of the completed ones."""
+    if len(times) < 3 or not times[-3]:
+        return times[-1] * GROWTH
+    growth = (times[-1] / times[-3]) ** 0.5
+    return times[-1] * min(max(growth, MIN_GROWTH), MAX_GROWTH)
+
+
+class SearchTimeout(Exception):
+    """Raised inside the tree when the hard deadline passes."""
+
+
+def score_to_tt(score, ply):
+    """Store mate scores as distance from the node rather than the root."""
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+def bitbase_score(pos, entry, ply):
+    """Search score of a bitbase result: exact mates, or a known win kept progressing by the eval."""
+    result, plies = entry
+    if not result:
+        return 0
+    if plies is None:
+        return result * KNOWN_WIN + evaluate(pos)
+    return result * (MATE - ply - plies)
+
+
+class Searcher:
+    """
+    Alpha-beta searcher. One instance can be reused across moves so the
+    transposition table carries over; per-search counters are reset by
+    `search()`.
+    """
+
+    def __init__(self, tt=None):
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.orderer = MoveOrderer()
+        self.nodes = 0
+        self.depth = 0
+        self.deadline = 0.0
+        self.node_limit = 0
+        self.pv = array('H')
+        self.iterations = []  # (depth, move, nodes so far) per completed depth
+        self.root_move, self.root_score = NO_MOVE, 0
+
+    def search(self, pos, time_limit, max_depth=MAX_DEPTH, hint=NO_MOVE, max_nodes=None,
+               soft_limit=None):
+        """
+        Search `pos` for at most `time_limit` seconds (and `max_nodes` nodes,
+        if given), trying `hint` (or the transposition table move) first.
+        No new depth is started after `soft_limit` seconds (at most half the
+        hard limit, which an unstable root stretches it towards), nor one
+        expected to run past twice the soft limit or the hard limit.
+
+        Returns (move, score, depth) for the last fully completed depth,
+        or the best root move of an aborted depth once it has searched at
+        least one. The move is NO_MOVE only when the side to move has no
+        legal moves.
+        """
+        start = perf_counter()
+        self.deadline = start + time_limit
+        max_soft = time_limit * 0.5
+        soft = max_soft if soft_limit is None else min(soft_limit, max_soft)
+        self.node_limit = max_nodes or 1 << 62
+        self.nodes = 0
+        self.depth = 0
+        self.pv = array('H')
+        self.iterations = []
+        self.tt.new_search()
+        self.orderer.new_search()
+
+        root_moves = pos.legal_moves()
+        if not root_moves:
+            return NO_MOVE, (-MATE if pos.in_check() else 0), 0
+        if not hint:
+            entry = self.tt.probe(pos.key)
+            hint = entry[0] if entry else NO_MOVE
+        if hint in root_moves:
+            root_moves.remove(hint)
+            root_moves.insert(0, hint)
+        best_move, best_score = root_moves[0], 0
+        history_len = len(pos.history)
+        if len(root_moves) == 1:
+            self.pv = array('H', [best_move])
+            return best_move, best_score, 0
+
+        times = []  # seconds taken by each completed depth
+        for depth in range(1, max_depth + 1):
+            iteration_start = perf_counter()
+            try:
+                score, move = self._root(pos, root_moves, depth)
+            except SearchTimeout:
+                # Unwind the moves left on the board by the aborted iteration
+                while len(pos.history) > history_len:
+                    pos.unmake()
+                # Root moves searched to the full depth beat the shallower result
+                if self.root_move:
+                    best_move, best_score = self.root_move, self.root_score
+                    self.pv = self._tt_pv(pos, best_move, depth)
+                break
+            now = perf_counter()
+            times.append(now - iteration_start)
+            if depth > 1 and (move != best_move or score < best_score - FAIL_LOW_MARGIN):
+                soft = min(soft * UNSTABLE_EXTENSION, max_soft)
+            best_move, best_score, self.depth = move, score, depth
+            self.iterations.append((depth, move, self.nodes))
+            self.pv = self._tt_pv(pos, move, depth)
+            # Search the previous best move first at the next depth
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            if abs(score) >= MATE_BOUND:
+                break
+            elapsed = now - start
+            if elapsed > soft or elapsed + predicted_cost(times) > min(soft * SOFT_OVERRUN, time_limit):
+                break
+        return best_move, best_score, self.depth
+
+    def _tt_pv(self, pos, move, depth):
+        """Principal variation: the root move followed by TT best moves."""
+        pv = array('H')
+        while move and len(pv) < depth and move in pos.legal_moves():
+            pv.append(move)
+            pos.make(move)
+            entry = self.tt.probe(pos.key)
+            move = entry[0] if entry else NO_MOVE
+        for _ in pv:
+            pos.unmake()
+        return pv
+
+    def _root(self, pos, moves, depth):
+        alpha, beta = -INF, INF
+        best_move = moves[0]
+        # Best fully searched move so far, kept if the iteration is aborted
+        self.root_move, self.root_score = NO_MOVE, 0
+        for move in moves:
+            pos.make(move)
+            score = -self._negamax(pos, depth - 1, -beta, -alpha, 1)
+            pos.unmake()
+            if score > alpha:
+                alpha, best_move = score, move
+                self.root_move, self.root_score = move, score
+        self.tt.store(pos.key, best_move, score_to_tt(alpha, 0), depth, EXACT)
+        return alpha, best_move
+
+    def _negamax(self, pos, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & CHECK_EVERY and (perf_counter() >= self.deadline
+                                             or self.nodes >= self.node_limit):
+            raise SearchTimeout
+        if pos.halfmove >= 100 or pos.is_repetition():
+            return 0
+        entry = probe_bitbase(pos)
+        if entry is not None:
+            return bitbase_score(pos, entry, ply)
+        if depth <= 0:
+            return self._quiesce(pos, alpha, beta, ply)
+
+        key = pos.key
+        tt_move = NO_MOVE
+        entry = self.tt.probe(key)
+        if entry is not None:
+            tt_move, tt_score, tt_depth, bound = entry
+            if tt_depth >= depth:
+                tt_score = score_from_tt(tt_score, ply)
+                if (bound == EXACT or (bound == LOWER and tt_score >= beta)
+                        or (bound == UPPER and tt_score <= alpha)):
+                    return tt_score
+
+        alpha_orig = alpha
+        best, best_move = -INF, NO_MOVE
+        orderer = self.orderer
+        tried = orderer.tried[ply]
+        n_tried = 0
+        for move in orderer.staged(pos, tt_move, ply):
+            quiet = is_quiet(pos, move)
+            if not pos.make(move):
+                continue
+            score = -self._negamax(pos, depth - 1, -beta, -alpha, ply + 1)
+            pos.unmake()
+            if score > best:
+                best, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if quiet:
+                            orderer.cutoff(pos, move, depth, ply, tried[:n_tried])
+                        break
+            if quiet:
+                tried[n_tried] = move
+                n_tried += 1
+
+        if best == -INF:
+            return -MATE + ply if pos.in_check() else 0
+        if best >= beta:
+            bound = LOWER
+        elif best > alpha_orig:
+            bound = EXACT
+        else:
+            bound, best_move = UPPER, NO_MOVE
+        self.tt.store(key, best_move, score_to_tt(best, ply), depth, bound)
+        return best
+
+    def _quiesce(self, pos, alpha, beta, ply):
+        """Capture-only search from a stand-pat score; all evasions when in check."""
+        self.nodes += 1
+        if not self.nodes & CHECK_EVERY and (perf_counter() >= self.deadline
+                                             or self.nodes >= self.node_limit):
+            raise SearchTimeout
+        entry = probe_bitbase(pos)
+        if entry is not None:
+            return bitbase_score(pos, entry, ply)
+
+        in_check = pos.in_check()
+        if in_check:
+            best = -INF
+            moves = pos.pseudo_legal_moves()
+        else:
+            best = evaluate(pos)
+            if best >= beta or ply >= MAX_PLY:
+                return best
+            if best > alpha:
+                alpha = best
+            moves = []
+            pos.gen_noisy(moves)
+            moves.sort(key=lambda m: mvv_lva(pos, m), reverse=True)
+
+        squares = pos.squares
+        for move in moves:
+            if not in_check:
+                # Delta pruning: even winning the victim for free stays below alpha
+                if (move >> 14 == NORMAL
+                        and best + CAPTURE_GAIN[squares[(move >> 6) & 63]] + DELTA_MARGIN <= alpha):
+                    continue
+                # Captures that lose material in the exchange are never made
+                if not see_ge(pos, move):
+                    continue
+            if not pos.make(move):
+                continue
+            score = -self._quiesce(pos, -beta, -alpha, ply + 1)
+            pos.unmake()
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best == -INF:
+            return -MATE + ply
+        return best
+
+
+def search(pos, time_limit, max_depth=MAX_DEPTH):
+    """Convenience wrapper: search `pos` with a fresh Searcher."""
+    return Searcher().search(pos, time_limit, max_depth)
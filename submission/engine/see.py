@@ -0,0 +1,76 @@
+# submission/engine/see.py
+"""Static exchange evaluation on the destination square of a move."""
+from .board import (
+    PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, NORMAL, PROMOTION, EN_PASSANT,
+    BISHOP_MASK, ROOK_MASK, bishop_attacks, rook_attacks,
+)
+
+# Exchange values by piece code; EMPTY last
+SEE_VALUES = [100, 320, 330, 500, 900, 20000] * 2 + [0]
+
+
+def see(pos, move):
+    """
+    Material balance, in centipawns for the mover, of the capture sequence
+    started by `move` on its destination square when both sides recapture
+    with their least valuable attacker and may stop at any point.
+    """
+    fr = move & 63
+    to = (move >> 6) & 63
+    flag = move >> 14
+    bb = pos.bb
+    squares = pos.squares
+    occupied = pos.occupied
+
+    attacker = squares[fr]
+    occ = (occupied[0] | occupied[1]) ^ (1 << fr)
+    if flag == EN_PASSANT:
+        captured_value = SEE_VALUES[PAWN]
+        occ ^= 1 << (to - 8 if attacker < 6 else to + 8)
+    else:
+        captured_value = SEE_VALUES[squares[to]]
+    on_square = SEE_VALUES[attacker]
+    if flag == PROMOTION:
+        on_square = SEE_VALUES[KNIGHT + ((move >> 12) & 3)]
+        captured_value += on_square - SEE_VALUES[PAWN]
+
+    diag = bb[BISHOP] | bb[QUEEN] | bb[BISHOP + 6] | bb[QUEEN + 6]
+    line = bb[ROOK] | bb[QUEEN] | bb[ROOK + 6] | bb[QUEEN + 6]
+    attackers = pos.attackers_to(to, occ) & occ
+    gain = [captured_value]
+    side = (attacker // 6) ^ 1
+    while True:
+        mine = attackers & occupied[side]
+        if not mine:
+            break
+        # Least valuable attacker of the side to recapture
+        base = side * 6
+        for pt in range(6):
+            lva = mine & bb[base + pt]
+            if lva:
+                break
+        if pt == KING and attackers & occupied[side ^ 1]:
+            break  # the king may not capture onto a defended square
+        gain.append(on_square - gain[-1])
+        on_square = SEE_VALUES[pt]
+        occ ^= lva & -lva
+        # Sliders lined up behind the capturing piece join in (x-rays)
+        if diag & BISHOP_MASK[to]:
+            attackers |= bishop_attacks(to, occ) & diag
+        if line & ROOK_MASK[to]:
+            attackers |= rook_attacks(to, occ) & line
+        attackers &= occ
+        side ^= 1
+
+    for i in range(len(gain) - 1, 0, -1):
+        gain[i - 1] = -max(-gain[i - 1], gain[i])
+    return gain[0]
+
+
+def see_ge(pos, move, threshold=0):
+    """True if see(pos, move) >= threshold, skipping the swap loop when trivially so."""
+    squares = pos.squares
+    if (move >> 14 == NORMAL and SEE_VALUES[squares[(move >> 6) & 63]]
+            - SEE_VALUES[squares[move & 63]] >= threshold):
+        return True
+    return see(pos, move) >= threshold
@@ -0,0 +1,56 @@
+# submission/engine/timeman.py
+"""
+Per-move time allocation from the Kaggle clock.
+
+Every move gets `actTimeout` seconds for free; anything beyond it is
+charged to `remainingOverageTime`, and a side whose bank runs out loses.
+The allocator spreads the bank, less an emergency reserve, over the moves
+the game is still expected to last. Each move gets a soft limit, after
+which no new iteration is started, and a hard limit, at which the
+search aborts.
+"""
+
+INITIAL_BANK = 10.0  # seconds of overage time at the start of a game
+INCREMENT = 0.1  # seconds per move that are not charged to the bank
+RESERVE = 1.0  # part of the bank never planned for spending
+OVERHEAD = 0.01  # seconds per move spent outside the search
+EXPECTED_MOVES = 60  # our moves in a typical game
+MIN_MOVES_TO_GO = 15
+HARD_FACTOR = 2  # hard limit as a multiple of the soft one
+MAX_BANK_SHARE = 0.15  # most of the spendable bank one move may use
+
+
+def _field(source, name):
+    if source is None:
+        return None
+    if isinstance(source, dict):
+        return source.get(name)
+    return getattr(source, name, None)
+
+
+def read_clock(obs, configuration=None):
+    """
+    (remaining bank or None, step, increment) from a Kaggle observation and
+    configuration, given as dicts or attribute objects.
+    """
+    remaining = _field(obs, 'remainingOverageTime')
+    step = _field(obs, 'step')
+    increment = _field(configuration, 'actTimeout')
+    return (None if remaining is None else float(remaining),
+            int(step or 0),
+            INCREMENT if increment is None else float(increment))
+
+
+def allocate(remaining, step, increment=INCREMENT):
+    """
+    (soft, hard) seconds for this move. Without a known bank, or once it is
+    down to the reserve, only the free increment is used.
+    """
+    free = max(increment - OVERHEAD, 0.005)
+    spendable = 0.0 if remaining is None else remaining - RESERVE
+    if spendable <= 0:
+        return free * 0.5, free
+    moves_to_go = max(MIN_MOVES_TO_GO, EXPECTED_MOVES - step // 2)
+    soft = free + spendable / moves_to_go
+    hard = min(soft * HARD_FACTOR, free + spendable * MAX_BANK_SHARE)
+    return soft, hard
@@ -0,0 +1,103 @@
+# submission/engine/tt.py
+"""
+Transposition table in two preallocated `array('Q')` buffers.
+
+The table is split into buckets of two slots: slot 0 is depth-preferred
+(kept unless the new entry is at least as deep or the old one is from an
+earlier search), slot 1 is always replaced. Each slot stores the full key
+and one packed data word:
+
+    bits  0-15  move
+    bits 16-35  score + SCORE_OFFSET
+    bits 36-42  depth
+    bits 43-44  bound
+    bits 45-50  age
+"""
+from array import array
+
+EXACT, LOWER, UPPER = 1, 2, 3
+
+DEFAULT_SIZE = 1 << 19  # bytes
+SLOT_BYTES = 16
+SCORE_OFFSET = 1 << 19
+AGE_MASK = 63
+
+
+class TranspositionTable:
+    """Fixed-size, two-slot bucket transposition table."""
+
+    def __init__(self, size_bytes=DEFAULT_SIZE):
+        buckets = 1
+        while buckets * 2 * 2 * SLOT_BYTES <= size_bytes:
+            buckets *= 2
+        self.mask = buckets - 1
+        self.keys = array('Q', bytes(8 * 2 * buckets))
+        self.data = array('Q', bytes(8 * 2 * buckets))
+        self.age = 0
+        self.reset_stats()
+
+    @property
+    def size_bytes(self):
+        return (self.keys.itemsize * len(self.keys)
+                + self.data.itemsize * len(self.data))
+
+    def clear(self):
+        n = len(self.keys)
+        self.keys = array('Q', bytes(8 * n))
+        self.data = array('Q', bytes(8 * n))
+        self.age = 0
+
+    def new_search(self):
+        """Age the table so entries from earlier moves lose replacement priority."""
+        self.age = (self.age + 1) & AGE_MASK
+
+    def probe(self, key):
+        """Return (move, score, depth, bound) for `key`, or None on a miss."""
+        self.probes += 1
+        i = (key & self.mask) << 1
+        keys = self.keys
+        if keys[i] == key:
+            pass
+        elif keys[i + 1] == key:
+            i += 1
+        else:
+            return None
+        self.hits += 1
+        d = self.data[i]
+        return (d & 0xFFFF, ((d >> 16) & 0xFFFFF) - SCORE_OFFSET,
+                (d >> 36) & 0x7F, (d >> 43) & 3)
+
+    def store(self, key, move, score, depth, bound):
+        self.stores += 1
+        i = (key & self.mask) << 1
+        keys = self.keys
+        data = self.data
+        if keys[i] != key:
+            if keys[i + 1] == key:
+                i += 1
+            else:
+                old = data[i]
+                if keys[i] and old >> 45 == self.age and depth < (old >> 36) & 0x7F:
+                    i += 1  # keep the deeper entry, use the always-replace slot
+                if keys[i]:
+                    self.collisions += 1  # evicting another position
+        if not move and keys[i] == key:
+            move = data[i] & 0xFFFF  # keep the known best move
+        keys[i] = key
+        data[i] = (move | ((score + SCORE_OFFSET) << 16) | (depth << 36)
+                   | (bound << 43) | (self.age << 45))
+
+    def reset_stats(self):
+        self.probes = self.hits = self.stores = self.collisions = 0
+
+    def stats(self):
+        """Hit, store and collision rates plus occupancy, for sizing the table."""
+        used = sum(1 for k in self.keys if k)
+        return {
+            'size_bytes': self.size_bytes,
+            'probes': self.probes,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+            'stores': self.stores,
+            'collision_rate': self.collisions / self.stores if self.stores else 0.0,
+            'fill': used / len(self.keys),
+        }
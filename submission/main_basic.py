@@ -1,123 +1,105 @@
-from Chessnut import Game
+from .engine.board import (
+    Position, EMPTY, ROOK, KNIGHT, BISHOP, QUEEN,
+    move_from, move_to, move_promo, move_to_uci, parse_square,
+)
+from .engine.mate import find_mate
+from .engine.pawns import pawn_table
+from .engine.see import see
 import random
 
-PIECE_VALUES = {
-    'P': 100,   # Pawn
-    'N': 320,   # Knight
-    'B': 330,   # Bishop
-    'R': 500,   # Rook
-    'Q': 900,   # Queen
-    'K': 20000  # King
-}
-
-def evaluate_capture(game, move):
-    """Evaluate capture moves by material difference"""
-    captured_piece = game.board.get_piece(Game.xy2i(move[2:4]))
-    capturing_piece = game.board.get_piece(Game.xy2i(move[0:2]))
-    
-    captured_value = PIECE_VALUES.get(captured_piece.upper(), 0)
-    capturing_value = PIECE_VALUES.get(capturing_piece.upper(), 0)
-    
-    return captured_value - capturing_value
+def evaluate_capture(pos, move):
+    """Evaluate capture moves by the material won or lost over the whole exchange"""
+    return see(pos, move)
 
 def chess_bot(obs):
     """
     Chess bot that combines simple priorities with basic positional understanding.
     """
     try:
-        game = Game(obs['board'])
-        moves = list(game.get_moves())
-
-        if not moves:
-            return ""
+        pos = Position(obs['board'])
 
-        # 1. Immediate checkmate
-        for move in moves[:10]:
-            g = Game(obs['board'])
-            g.apply_move(move)
-            if g.status == Game.CHECKMATE:
-                return move
+        # 1. Checkmate in one, or a forced mate in two by checks. Quiet moves
+        # can mate too, so both stages are generated once and reused below
+        noisy, quiet = [], []
+        pos.gen_noisy(noisy)
+        pos.gen_quiet(quiet)
+        mate = find_mate(pos, noisy + quiet)
+        if mate:
+            return move_to_uci(mate)
 
-        # 2. Captures (now with evaluation)
+        # 2. Captures (now with evaluation), taken from the noisy moves alone;
+        # quiet moves are only checked for legality when no capture or promotion applies
+        noisy = pos.legal_noisy(noisy)
         captures = []
-        for move in moves:
-            if game.board.get_piece(Game.xy2i(move[2:4])) != ' ':
+        for move in noisy:
+            if pos.squares[move_to(move)] != EMPTY:
                 captures.append(move)
         
         if captures:
             # Sort captures by material gain
-            captures.sort(key=lambda m: evaluate_capture(game, m), reverse=True)
-            return captures[0]
+            captures.sort(key=lambda m: evaluate_capture(pos, m), reverse=True)
+            return move_to_uci(captures[0])
 
         # 3. Queen promotions
-        for move in moves:
-            if "q" in move.lower():
-                return move
+        for move in noisy:
+            if move_promo(move) == QUEEN:
+                return move_to_uci(move)
+
+        moves = noisy + pos.legal_quiet(quiet)
+        if not moves:
+            return ""
 
         # 4. Simple positional play
-        center_squares = [Game.xy2i(sq) for sq in ['e4', 'd4', 'e5', 'd5']]
+        center_squares = [parse_square(sq) for sq in ['e4', 'd4', 'e5', 'd5']]
+        open_files = pawn_table.probe(pos)[2]
         for move in moves:
-            to_square = Game.xy2i(move[2:4])
+            to_square = move_to(move)
             # Prioritize center control in opening/middlegame
             if to_square in center_squares:
-                return move
+                return move_to_uci(move)
             
             # Look for rook moves to open files
-            piece = game.board.get_piece(Game.xy2i(move[0:2]))
-            if piece.upper() == 'R':
-                file_idx = to_square % 8
-                open_file = True
-                for rank in range(8):
-                    if game.board.get_piece(rank * 8 + file_idx).upper() == 'P':
-                        open_file = False
-                        break
-                if open_file:
-                    return move
+            piece = pos.squares[move_from(move)]
+            if piece != EMPTY and piece % 6 == ROOK and open_files >> (to_square % 8) & 1:
+                return move_to_uci(move)
 
         # 5. Random move with slight preference for knights and bishops early
-        early_moves = [m for m in moves if game.board.get_piece(Game.xy2i(m[0:2])).upper() in ['N', 'B']]
-        return random.choice(early_moves) if early_moves else random.choice(moves)
+        early_moves = [m for m in moves if pos.squares[move_from(m)] % 6 in (KNIGHT, BISHOP)]
+        return move_to_uci(random.choice(early_moves) if early_moves else random.choice(moves))
 
     except Exception as e:
         # Emergency fallback
         try:
-            game = Game(obs['board'])
-            return random.choice(list(game.get_moves()))
+            return move_to_uci(random.choice(Position(obs['board']).legal_moves()))
         except:
             return ""
 
     
-    def evaluate_move(game, move):
+    def evaluate_move(pos, move):
         """Sophisticated move evaluation for non-obvious positions"""
         score = 0
-        test_game = Game(game.board.fen)
-        test_game.apply_move(move)
         
-        # Basic material evaluation
-        to_square = Game.xy2i(move[2:4])
-        captured_piece = game.board.get_piece(to_square)
-        if captured_piece != ' ':
-            score += PIECE_VALUES.get(captured_piece.upper(), 0)
+        # Material won or lost by the capture sequence
+        to_square = move_to(move)
+        if pos.squares[to_square] != EMPTY:
+            score += see(pos, move)
         
         # Promotion
-        if 'q' in move.lower():
+        if move_promo(move) == QUEEN:
             score += 800
         
         # Center control (e4, d4, e5, d5)
-        center_squares = [28, 29, 36, 37]
+        center_squares = [parse_square(sq) for sq in ['e4', 'd4', 'e5', 'd5']]
         if to_square in center_squares:
             score += 30
         
         # Rook on open file
-        piece = game.board.get_piece(Game.xy2i(move[0:2]))
-        if piece.upper() == 'R':
-            file_idx = to_square % 8
-            open_file = True
-            for rank in range(8):
-                if test_game.board.get_piece(rank * 8 + file_idx).upper() == 'P':
-                    open_file = False
-                    break
-            if open_file:
+        piece = pos.squares[move_from(move)]
+        if piece != EMPTY and piece % 6 == ROOK:
+            pos.make(move)
+            open_files = pawn_table.probe(pos)[2]
+            pos.unmake()
+            if open_files >> (to_square % 8) & 1:
                 score += 50
                 
         return score
@@ -128,59 +110,61 @@ def chess_bot_hybrid(obs):
     """
     try:
         # Parse the current board state
-        game = Game(obs['board'])
-        moves = list(game.get_moves())
-        
-        if not moves:
-            return ""
-            
-        # 1. First priority: Checkmate
-        for move in moves[:10]:  # Check first 10 moves for quick mates
-            g = Game(obs['board'])
-            g.apply_move(move)
-            if g.status == Game.CHECKMATE:
-                return move
-        
-        # 2. Second priority: Captures
+        pos = Position(obs['board'])
+
+        # 1. First priority: Checkmate (in one, or in two by checks). Quiet
+        # moves can mate too, so both stages are generated once and reused.
+        noisy, quiet = [], []
+        pos.gen_noisy(noisy)
+        pos.gen_quiet(quiet)
+        mate = find_mate(pos, noisy + quiet)
+        if mate:
+            return move_to_uci(mate)
+
+        # 2. Second priority: Captures. Captures and promotions come from the
+        # noisy moves alone; quiet moves are only checked for legality if neither applies.
+        noisy = pos.legal_noisy(noisy)
         captures = []
-        for move in moves:
-            if game.board.get_piece(Game.xy2i(move[2:4])) != ' ':
+        for move in noisy:
+            if pos.squares[move_to(move)] != EMPTY:
                 captures.append(move)
         if captures:
             # If there are multiple captures, evaluate them
             if len(captures) > 1:
-                capture_scores = [(move, evaluate_move(game, move)) for move in captures]
-                return max(capture_scores, key=lambda x: x[1])[0]
-            return captures[0]
-        
+                capture_scores = [(move, evaluate_move(pos, move)) for move in captures]
+                return move_to_uci(max(capture_scores, key=lambda x: x[1])[0])
+            return move_to_uci(captures[0])
+
         # 3. Third priority: Queen promotions
-        for move in moves:
-            if "q" in move.lower():
-                return move
-        
+        for move in noisy:
+            if move_promo(move) == QUEEN:
+                return move_to_uci(move)
+
+        moves = noisy + pos.legal_quiet(quiet)
+        if not moves:
+            return ""
+
         # 4. Fourth priority: Evaluate remaining moves
-        # Only evaluate top 10 moves to save time
         move_scores = []
         for move in moves:
-            score = evaluate_move(game, move)
+            score = evaluate_move(pos, move)
             move_scores.append((move, score))
-        
+
         # Sort by score and select from top 3
         if move_scores:
             move_scores.sort(key=lambda x: x[1], reverse=True)
             top_moves = move_scores[:3]
-            return random.choice([move for move, _ in top_moves])
-        
+            return move_to_uci(random.choice([move for move, _ in top_moves]))
+
         # 5. Final fallback: Random move
-        return random.choice(moves)
-        
+        return move_to_uci(random.choice(moves))
+
     except Exception as e:
         # Emergency fallback
         try:
-            game = Game(obs['board'])
-            moves = list(game.get_moves())
+            moves = Position(obs['board']).legal_moves()
             if moves:
-                return random.choice(moves)
+                return move_to_uci(random.choice(moves))
             return ""
         except:
             return ""
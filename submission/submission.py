@@ -1,10 +1,8 @@
-# submission/submission.py
-from Chessnut import Game
-import random
-
 # submission/submission.py
 from .bots.basic_bot import chess_bot_basic
 from .bots.hybrid_bot import chess_bot_hybrid
+from .bots.search_bot import chess_bot_search
+from .bots.dispatch_bot import chess_bot_dispatch
 
 # Choose which bot to use as the main submission
-chess_bot = chess_bot_basic  # or chess_bot_hybrid
\ No newline at end of file
+chess_bot = chess_bot_dispatch  # or chess_bot_search / chess_bot_basic / chess_bot_hybrid
@@ -0,0 +1,14 @@
+# tests/harness.py
+"""
+How the environment calls an agent, shared by the test harness and the
+tools. Kept free of the test modules' imports so tools can use it alone.
+"""
+import inspect
+from typing import Dict
+
+
+def call_agent(bot_func, obs: Dict, config: Dict) -> str:
+    """Call a bot with (obs) or (obs, config), depending on what it accepts"""
+    if len(inspect.signature(bot_func).parameters) > 1:
+        return bot_func(obs, config)
+    return bot_func(obs)
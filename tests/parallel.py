@@ -0,0 +1,92 @@
+# tests/parallel.py
+"""
+Play benchmark games in parallel, one single-threaded game per worker
+process at a time.
+
+Each worker imports the bot once, owns its own Stockfish process and plays
+whichever games it is handed. Results come back in the order the games
+were listed, and every game seeds the global random module (used by the
+bots and RandomPlayer) from its own seed, so a match is reproducible up
+to the bot's own timing.
+"""
+import os
+import random
+import dataclasses
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import chess
+
+from .test_utils import GameResult, KaggleClock, LatencyRecorder, RandomPlayer, StockfishPlayer, play_single_game
+
+
+@dataclasses.dataclass(frozen=True)
+class GameSpec:
+    index: int
+    opponent: str  # 'random' or 'stockfish'
+    bot_color: chess.Color
+    seed: int
+    clocked: bool = False
+
+
+def match_specs(random_games: int = 10, stockfish_games: int = 5, seed: int = 0,
+                clocked: bool = False) -> List[GameSpec]:
+    """The games of a benchmark session, alternating colors, with per-game seeds"""
+    specs = []
+    for opponent, count in (('random', random_games), ('stockfish', stockfish_games)):
+        for i in range(count):
+            specs.append(GameSpec(index=len(specs), opponent=opponent,
+                                  bot_color=chess.WHITE if i % 2 == 0 else chess.BLACK,
+                                  seed=seed * 100003 + len(specs), clocked=clocked))
+    return specs
+
+
+# Per-worker state, set up by _init_worker
+_bot = None
+_budget = 0.1
+_stockfish = None
+_stockfish_error = None
+
+
+def _init_worker(bot_func, stockfish_elo: int, move_budget: float):
+    global _bot, _budget, _stockfish, _stockfish_error
+    _bot, _budget = bot_func, move_budget
+    try:
+        _stockfish = StockfishPlayer(elo=stockfish_elo)
+    except Exception as e:
+        _stockfish_error = str(e)
+
+
+def _play(spec: GameSpec) -> Tuple[Optional[GameResult], list]:
+    """One game in a worker: (result or None without Stockfish, latency samples)"""
+    if spec.opponent == 'stockfish':
+        if _stockfish is None:
+            return None, []
+        opponent = _stockfish
+    else:
+        opponent = RandomPlayer()
+    random.seed(spec.seed)
+    recorder = LatencyRecorder(_bot, _budget)
+    clocks = {chess.WHITE: KaggleClock(), chess.BLACK: KaggleClock()} if spec.clocked else None
+    return play_single_game(recorder, opponent, spec.bot_color, clocks), recorder.samples
+
+
+def play_games(bot_func, specs: List[GameSpec], workers: Optional[int] = None,
+               stockfish_elo: int = 1200, move_budget: float = 0.1,
+               recorder: Optional[LatencyRecorder] = None) -> List[Optional[GameResult]]:
+    """
+    Play `specs` over a process pool with one worker per core (or `workers`).
+    `bot_func` must be importable by name. Results are in the order of
+    `specs`; Stockfish games are None when the workers could not start it.
+    Latency samples of every bot move are added to `recorder` in the same order.
+    """
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=context,
+                             initializer=_init_worker,
+                             initargs=(bot_func, stockfish_elo, move_budget)) as pool:
+        outcomes = list(pool.map(_play, specs))
+    if recorder is not None:
+        for _, samples in outcomes:
+            recorder.samples.extend(samples)
+    return [result for result, _ in outcomes]
@@ -0,0 +1,211 @@
+# tests/sandbox.py
+"""
+Run a bot in a resource-limited child process, the way the competition does.
+
+The child imports the bot, pins itself to one CPU core and caps its address
+space (RLIMIT_AS) at what the interpreter and the imported bot already use
+plus the memory budget; CPython cannot start inside the bare 5 MiB, so the
+budget is applied on top of that baseline. Moves are exchanged as JSON
+lines over the child's stdin/stdout:
+
+    parent -> child   {"obs": {...}, "config": {...}}
+    child -> parent   {"move": "e2e4", "cpu": 0.01, "rss": 12345678}
+                      {"error": "MemoryError", "cpu": ..., "rss": ...}
+
+The parent records CPU time and peak RSS per move and the move on which a
+memory, time or crash limit was hit. With `profile` set, the child runs the
+bot under BotProfiler and saves its output there when the sandbox closes.
+"""
+import os
+import sys
+import json
+import select
+import resource
+import importlib
+import subprocess
+import dataclasses
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tests.harness import call_agent
+from tests.test_utils import BotProfiler
+
+ROOT = Path(__file__).resolve().parent.parent
+MEMORY_BUDGET = 5 * 1024 * 1024  # competition limit, bytes
+MOVE_TIMEOUT = 10.0  # wall seconds for one move before the child is killed
+
+
+class SandboxLimitError(Exception):
+    """Raised by SandboxedBot when the child hits a limit"""
+
+
+@dataclasses.dataclass
+class MoveStats:
+    fen: str
+    cpu_time: float  # seconds of user + system CPU in the child
+    wall_time: float
+    rss: int  # child's peak RSS so far, bytes
+
+
+@dataclasses.dataclass
+class SandboxReport:
+    bot: str
+    memory_budget: int
+    cpu: Optional[int]
+    baseline_rss: int = 0  # peak RSS after importing the bot, bytes
+    moves: List[MoveStats] = dataclasses.field(default_factory=list)
+    limit_hit: Optional[str] = None  # 'memory', 'time' or 'crash'
+    limit_move: Optional[int] = None  # index into the moves played by the bot
+    limit_fen: Optional[str] = None
+    limit_detail: str = ''
+
+    @property
+    def peak_rss(self) -> int:
+        return max([self.baseline_rss] + [m.rss for m in self.moves])
+
+    @property
+    def cpu_time(self) -> float:
+        return sum(m.cpu_time for m in self.moves)
+
+
+def _address_space():
+    """Current virtual memory size of this process, bytes"""
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def _peak_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def load_bot(spec: str):
+    """'package.module:function' -> the bot function"""
+    module, _, name = spec.partition(':')
+    return getattr(importlib.import_module(module), name)
+
+
+def child_main(spec: str, memory_budget: int, cpu: Optional[int], profile: Optional[str] = None):
+    """Child side of the protocol: serve moves until stdin closes"""
+    # Keep stdout for the protocol; anything the bot prints goes to stderr
+    channel = os.fdopen(os.dup(1), 'w', buffering=1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    bot = load_bot(spec)
+    profiler = None
+    if profile:
+        bot = profiler = BotProfiler(bot)
+    if cpu is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cpu})
+    limit = _address_space() + memory_budget
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    channel.write(json.dumps({'ready': True, 'rss': _peak_rss()}) + '\n')
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        start = _cpu_seconds()
+        try:
+            reply = {'move': call_agent(bot, request['obs'], request.get('config'))}
+        except MemoryError:
+            reply = {'error': 'MemoryError'}
+        except Exception as e:
+            reply = {'error': f"{type(e).__name__}: {e}"}
+        reply['cpu'] = _cpu_seconds() - start
+        reply['rss'] = _peak_rss()
+        channel.write(json.dumps(reply) + '\n')
+    if profiler is not None:
+        path = Path(profile)
+        profiler.save(path.parent, path.name)
+
+
+class SandboxedBot:
+    """
+    A bot running in a limited child process, callable like the bot itself.
+
+    Use as a context manager, or call close(). `report` collects per-move
+    CPU time and peak RSS; when a limit is hit it records which one and on
+    which move, and the call raises SandboxLimitError. `profile`, a path
+    without suffix, makes the child profile the bot and write
+    <profile>.pstats and <profile>.collapsed on close.
+    """
+
+    def __init__(self, spec: str, memory_budget: int = MEMORY_BUDGET, cpu: Optional[int] = 0,
+                 move_timeout: float = MOVE_TIMEOUT, profile: Optional[Path] = None):
+        self.spec = spec
+        self.move_timeout = move_timeout
+        self.report = SandboxReport(bot=spec, memory_budget=memory_budget, cpu=cpu)
+        cmd = [sys.executable, '-m', 'tests.sandbox', spec, str(memory_budget),
+               '-' if cpu is None else str(cpu)]
+        if profile is not None:
+            cmd.append(str(Path(profile).resolve()))
+        self.process = subprocess.Popen(cmd, cwd=ROOT, stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, text=True, bufsize=1)
+        hello = self._receive(self.move_timeout)
+        if hello is None or not hello.get('ready'):
+            self.close()
+            raise SandboxLimitError(f"{spec} failed to start in the sandbox")
+        self.report.baseline_rss = hello['rss']
+
+    def _receive(self, timeout: float) -> Optional[Dict]:
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            return None
+        line = self.process.stdout.readline()
+        return json.loads(line) if line else None
+
+    def _limit(self, kind: str, fen: str, detail: str):
+        report = self.report
+        report.limit_hit, report.limit_move, report.limit_fen = kind, len(report.moves), fen
+        report.limit_detail = detail
+        self.close()
+        raise SandboxLimitError(f"{kind} limit hit on move {report.limit_move}: {detail}")
+
+    def __call__(self, obs: Dict, config: Optional[Dict] = None) -> str:
+        if self.report.limit_hit:
+            raise SandboxLimitError(f"sandbox already stopped ({self.report.limit_hit})")
+        fen = obs['board']
+        start = time.perf_counter()
+        try:
+            self.process.stdin.write(json.dumps({'obs': dict(obs), 'config': config}) + '\n')
+        except BrokenPipeError:
+            self._limit('crash', fen, 'child exited')
+        reply = self._receive(self.move_timeout)
+        wall = time.perf_counter() - start
+        if reply is None:
+            if self.process.poll() is None:
+                self._limit('time', fen, f"no move after {wall:.2f}s")
+            self._limit('crash', fen, f"child exited with code {self.process.returncode}")
+        if reply.get('error') == 'MemoryError':
+            self._limit('memory', fen, f"MemoryError at peak RSS {reply['rss']} bytes")
+        self.report.moves.append(MoveStats(fen=fen, cpu_time=reply['cpu'], wall_time=wall,
+                                           rss=reply['rss']))
+        if 'error' in reply:
+            raise RuntimeError(reply['error'])
+        return reply['move']
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process.stdout.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == '__main__':
+    child_main(sys.argv[1], int(sys.argv[2]), None if sys.argv[3] == '-' else int(sys.argv[3]),
+               sys.argv[4] if len(sys.argv) > 4 else None)
@@ -6,21 +6,53 @@ import time
 import random
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from .test_utils import (
     GameResult,  # Added this import
     TestSession, 
     RandomPlayer, 
-    StockfishPlayer
+    StockfishPlayer,
+    KaggleClock,
+    kaggle_observation,
+    MemoryProfiler,
+    LatencyRecorder,
+    BotProfiler,
+    play_single_game
 )
-def run_test_session(bot_func, name: str, save_results: bool = True):
-    """Utility function to run a full test session"""
+from .parallel import match_specs, play_games
+def new_clocks(clocked: bool):
+    """Fresh Kaggle clocks for both sides, or None for an untimed game"""
+    return {chess.WHITE: KaggleClock(), chess.BLACK: KaggleClock()} if clocked else None
+
+def run_test_session(bot_func, name: str, save_results: bool = True, clocked: bool = False,
+                     profile_memory: bool = False, move_budget: float = 0.1, profile: bool = False,
+                     workers: Optional[int] = None, seed: int = 0):
+    """
+    Utility function to run a full test session; `clocked` plays under Kaggle clocks.
+    Every bot move of every game is timed against `move_budget` seconds.
+    `profile_memory` also traces those moves with tracemalloc (slow, and it
+    inflates the latencies); otherwise only the moves of the memory
+    measurement are traced. `profile` runs the game moves under BotProfiler
+    and saves its pstats and collapsed stacks under test_results/profiles.
+    With `workers` (0 for one per core) the games are played in parallel
+    processes from per-game seeds derived from `seed`; the profilers then
+    only see the memory and timing measurements.
+    """
+    cpu_profiler = BotProfiler(bot_func) if profile else None
+    recorder = LatencyRecorder(cpu_profiler or bot_func, move_budget)
+    profiler = MemoryProfiler(recorder if profile_memory else bot_func)
+    game_bot = profiler if profile_memory else recorder
     print(f"\n{'='*50}")
     print(f"Testing {name} bot")
     print(f"{'='*50}")
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    pooled = None
+    if workers is not None:
+        pooled = play_games(bot_func, match_specs(10, 5, seed, clocked), workers or None,
+                            move_budget=move_budget, recorder=recorder)
     
     # Test against random player
     print("\n📊 Random Player Games:")
@@ -30,7 +62,10 @@ def run_test_session(bot_func, name: str, save_results: bool = True):
     for i in range(10):
         bot_color = chess.WHITE if i % 2 == 0 else chess.BLACK
         print(f"\nGame {i+1} - Bot playing as {'White' if bot_color else 'Black'}")
-        result = play_single_game(bot_func, random_player, bot_color)
+        if pooled is not None:
+            result = pooled[i]
+        else:
+            result = play_single_game(game_bot, random_player, bot_color, new_clocks(clocked))
         random_results.append(result)
         print(f"Result: {result.winner} in {result.moves} moves ({result.ending})")
     
@@ -44,13 +79,19 @@ def run_test_session(bot_func, name: str, save_results: bool = True):
     # Test against Stockfish
     print("\n🤖 Stockfish Games (ELO 1200):")
     try:
-        stockfish = StockfishPlayer(elo=1200)
+        if pooled is None:
+            stockfish = StockfishPlayer(elo=1200)
+        elif pooled[10] is None:
+            raise RuntimeError("Stockfish did not start in the workers")
         stockfish_results = []
         
         for i in range(5):
             bot_color = chess.WHITE if i % 2 == 0 else chess.BLACK
             print(f"\nGame {i+1} - Bot playing as {'White' if bot_color else 'Black'}")
-            result = play_single_game(bot_func, stockfish, bot_color)
+            if pooled is not None:
+                result = pooled[10 + i]
+            else:
+                result = play_single_game(game_bot, stockfish, bot_color, new_clocks(clocked))
             stockfish_results.append(result)
             print(f"Result: {result.winner} in {result.moves} moves ({result.ending})")
         
@@ -69,9 +110,29 @@ def run_test_session(bot_func, name: str, save_results: bool = True):
     # Performance metrics
     print("\n⚡ Performance Metrics:")
     memory_usage = measure_memory_usage(bot_func)
+    if not profile_memory:
+        trace_memory(profiler)
+    memory_profile = profiler.summary()
     move_times = measure_move_times(bot_func)
     avg_time = sum(move_times) / len(move_times)
+    latency = recorder.report()
     print(f"Memory Usage: {memory_usage:.2f} MB")
+    print(f"Peak Allocation per Move: {memory_profile['max_peak'] / 1024:.1f} KiB "
+          f"(max net {memory_profile['max_net'] / 1024:.1f} KiB over {memory_profile['moves']} moves)")
+    for line in memory_profile['worst_moves'][0]['top']:
+        print(f"    {line}")
+    print(f"Game Move Latency: p50 {latency['p50_ms']:.1f} ms, p90 {latency['p90_ms']:.1f} ms, "
+          f"p99 {latency['p99_ms']:.1f} ms, max {latency['max_ms']:.1f} ms; "
+          f"{latency['over_budget']}/{latency['moves']} over {latency['budget_ms']:.0f} ms")
+    for phase, stats in latency['by_phase'].items():
+        print(f"    {phase:<10} p50 {stats['p50_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms ({stats['moves']} moves)")
+    for worst in latency['worst'][:3]:
+        print(f"    {worst['ms']:.1f} ms  {worst['fen']}")
+    if cpu_profiler is not None:
+        paths = cpu_profiler.save(Path('test_results') / 'profiles', f"{name}_{timestamp}")
+        print(f"Profile ({cpu_profiler.calls} moves): {', '.join(map(str, paths))}")
+        for line in cpu_profiler.hot_functions():
+            print(f"    {line}")
     print(f"Average Move Time: {avg_time*1000:.1f} ms")
     
     session = TestSession(
@@ -80,7 +141,9 @@ def run_test_session(bot_func, name: str, save_results: bool = True):
         random_results=random_results,
         stockfish_results=stockfish_results,
         memory_usage=memory_usage,
-        avg_move_time=avg_time
+        avg_move_time=avg_time,
+        memory_profile=memory_profile,
+        latency=latency
     )
     
     if save_results:
@@ -104,53 +167,13 @@ def test_basic_bot(capsys):
     assert win_rate >= 0.2, f"Win rate against random too low: {win_rate:.2%}"
     assert results.avg_move_time < 0.1, f"Moves taking too long: {results.avg_move_time:.3f}s"
     assert results.memory_usage < 5, f"Using too much memory: {results.memory_usage:.2f}MB"
+    assert results.memory_profile['max_peak'] < 5 * 1024 * 1024
+    # The bot plays White in the even-numbered games of each series
+    assert results.latency['moves'] == sum((r.moves + 1) // 2 if i % 2 == 0 else r.moves // 2
+                                           for games in (results.random_results, results.stockfish_results)
+                                           for i, r in enumerate(games))
 
 
-def play_single_game(bot_func, opponent, bot_color):
-    board = chess.Board()
-    moves = 0
-    start_time = time.time()
-    
-    while not board.is_game_over() and moves < 200:
-        is_bot_turn = (board.turn == bot_color)
-        
-        try:
-            if is_bot_turn:
-                obs = {'board': board.fen()}
-                move = bot_func(obs)
-                board.push_uci(move)
-            else:
-                move = opponent.get_move(board)
-                board.push(move)
-            moves += 1
-            
-        except Exception as e:
-            print(f"Error during game: {e}")
-            return GameResult(
-                winner='opponent',
-                moves=moves,
-                time_taken=time.time() - start_time,
-                ending='error',
-                final_fen=board.fen()
-            )
-    
-    time_taken = time.time() - start_time
-    
-    if board.is_checkmate():
-        winner = 'bot' if board.turn != bot_color else 'opponent'
-        ending = 'checkmate'
-    else:
-        winner = 'draw'
-        ending = 'other'
-        
-    return GameResult(
-        winner=winner,
-        moves=moves,
-        time_taken=time_taken,
-        ending=ending,
-        final_fen=board.fen()
-    )
-
 def measure_memory_usage(bot_func, num_moves=10):
     import psutil
     process = psutil.Process()
@@ -166,14 +189,22 @@ def measure_memory_usage(bot_func, num_moves=10):
     final_memory = process.memory_info().rss
     return (final_memory - initial_memory) / (1024 * 1024)
 
+def trace_memory(profiler, num_moves=10):
+    """Play the memory measurement's opening moves through a MemoryProfiler"""
+    board = chess.Board()
+    for _ in range(num_moves):
+        move = profiler({'board': board.fen()})
+        if move:
+            board.push_uci(move)
+
 def measure_move_times(bot_func, num_moves=10):
     times = []
     board = chess.Board()
     
     for _ in range(num_moves):
-        start = time.time()
+        start = time.perf_counter_ns()
         move = bot_func({'board': board.fen()})
-        times.append(time.time() - start)
+        times.append((time.perf_counter_ns() - start) / 1e9)
         if move:
             board.push_uci(move)
     
@@ -192,4 +223,151 @@ def test_hybrid_bot():
     win_rate = random_wins / len(results.random_results)
     assert win_rate >= 0.2, f"Win rate against random too low: {win_rate:.2%}"
     assert results.avg_move_time < 0.1, f"Moves taking too long: {results.avg_move_time:.3f}s"
-    assert results.memory_usage < 5, f"Using too much memory: {results.memory_usage:.2f}MB"
\ No newline at end of file
+    assert results.memory_usage < 5, f"Using too much memory: {results.memory_usage:.2f}MB"
+
+def test_search_bot():
+    """Test search bot implementation"""
+    from submission.bots.search_bot import chess_bot_search
+    results = run_test_session(chess_bot_search, "search")
+    
+    # Assertions
+    random_wins = sum(1 for r in results.random_results if r.winner == 'bot')
+    win_rate = random_wins / len(results.random_results)
+    assert win_rate >= 0.5, f"Win rate against random too low: {win_rate:.2%}"
+    assert results.avg_move_time < 0.1, f"Moves taking too long: {results.avg_move_time:.3f}s"
+    assert results.memory_usage < 5, f"Using too much memory: {results.memory_usage:.2f}MB"
+
+
+def test_kaggle_clock_emulation():
+    """Clocked games send Kaggle observations and forfeit a side whose bank runs out"""
+    from submission.bots.dispatch_bot import chess_bot_dispatch
+
+    seen = []
+    def slow_bot(obs):
+        seen.append(obs)
+        time.sleep(0.15)
+        return random.choice(list(chess.Board(obs['board']).legal_moves)).uci()
+
+    clocks = {chess.WHITE: KaggleClock(remaining=0.12), chess.BLACK: KaggleClock()}
+    result = play_single_game(slow_bot, RandomPlayer(), chess.WHITE, clocks)
+    assert (result.winner, result.ending) == ('opponent', 'timeout')
+    assert result.bot_time_left < 0
+    assert [(o['mark'], o['step']) for o in seen] == [('white', 0), ('white', 2), ('white', 4)]
+    assert seen[1]['remainingOverageTime'] < seen[0]['remainingOverageTime'] == 0.12
+
+    clocks = {chess.WHITE: KaggleClock(), chess.BLACK: KaggleClock(remaining=2.0)}
+    result = play_single_game(chess_bot_dispatch, RandomPlayer(), chess.BLACK, clocks)
+    assert result.ending != 'timeout' and result.bot_time_left >= 0
+
+
+def test_dispatcher_searches_through_the_middlegame():
+    """Under the Kaggle clock the search keeps every middlegame move past move 40"""
+    from submission.bots.dispatch_bot import Dispatcher, SIMPLE_PIECES, PIECE_MARGIN, piece_count
+
+    board = chess.Board()
+    dispatchers = {chess.WHITE: Dispatcher(), chess.BLACK: Dispatcher()}
+    clocks = new_clocks(True)
+    middlegame = []  # strategies chosen with more pieces than the search is kept for anyway
+    while board.fullmove_number <= 45 and not board.is_game_over():
+        clock, dispatcher = clocks[board.turn], dispatchers[board.turn]
+        start = time.perf_counter()
+        move = dispatcher(kaggle_observation(board, clock), {'actTimeout': clock.increment})
+        assert clock.charge(time.perf_counter() - start)
+        if piece_count(board.fen()) > SIMPLE_PIECES + PIECE_MARGIN:
+            middlegame.append(dispatcher.strategy)
+        board.push_uci(move)
+    assert board.fullmove_number > 40
+    assert middlegame and set(middlegame) == {'search'}
+    assert not dispatchers[chess.WHITE].switches and not dispatchers[chess.BLACK].switches
+
+
+_hoard = []
+
+def memory_hog_bot(obs):
+    """Random mover that keeps 1 MiB more per move; runs out of a 5 MiB budget by its sixth move"""
+    _hoard.append(bytearray(1 << 20))
+    return random.choice(list(chess.Board(obs['board']).legal_moves)).uci()
+
+
+def test_sandboxed_bots(tmp_path):
+    """Bots run in a limited child process; the move that breaks a limit is reported"""
+    from .sandbox import SandboxedBot
+
+    with SandboxedBot('submission.bots.basic_bot:chess_bot_basic', profile=tmp_path / 'basic') as bot:
+        result = play_single_game(bot, RandomPlayer(), chess.WHITE)
+    report = bot.report
+    assert result.ending != 'error' and report.limit_hit is None
+    assert len(report.moves) == (result.moves + 1) // 2
+    assert report.peak_rss >= report.baseline_rss > 0
+    assert all(m.cpu_time >= 0 for m in report.moves)
+    assert (tmp_path / 'basic.pstats').exists() and (tmp_path / 'basic.collapsed').exists()
+
+    with SandboxedBot('tests.test_benchmarks:memory_hog_bot') as bot:
+        result = play_single_game(bot, RandomPlayer(), chess.WHITE)
+    report = bot.report
+    assert result.ending == 'error'
+    assert report.limit_hit == 'memory' and 2 <= report.limit_move <= 5
+    assert report.limit_fen == result.final_fen
+
+
+def test_memory_profiler():
+    """Every wrapped move is traced, with peak, net and the allocating lines"""
+    profiler = MemoryProfiler(memory_hog_bot)
+    trace_memory(profiler, num_moves=2)
+    summary = profiler.summary()
+    assert summary['moves'] == 2
+    assert summary['max_net'] >= 1 << 20 and summary['max_peak'] >= summary['max_net']
+    assert any('test_benchmarks.py' in line for line in summary['worst_moves'][0]['top'])
+    _hoard.clear()
+
+
+def test_latency_recorder():
+    """Every call is timed; slow moves are counted against the budget and listed"""
+    endgame = "8/5k2/8/8/8/8/3K4/4R3 w - - 0 60"
+
+    def bot(obs):
+        if obs['board'] == endgame:
+            time.sleep(0.02)
+        return random.choice(list(chess.Board(obs['board']).legal_moves)).uci()
+
+    recorder = LatencyRecorder(bot, budget=0.01)
+    for fen in [chess.STARTING_FEN] * 9 + [endgame]:
+        recorder({'board': fen})
+    report = recorder.report(worst=1)
+    assert report['moves'] == 10 and report['over_budget'] == 1
+    assert report['p50_ms'] <= report['p90_ms'] < 10 <= report['p99_ms'] == report['max_ms']
+    assert report['by_phase']['opening']['moves'] == 9 and report['by_pieces']['2-8']['moves'] == 1
+    assert report['worst'][0]['fen'] == endgame
+
+
+def test_bot_profiler(tmp_path):
+    """Profiling merges all calls into a pstats file and collapsed stacks"""
+    import pstats
+    from submission.bots.hybrid_bot import chess_bot_hybrid
+
+    profiler = BotProfiler(chess_bot_hybrid, sample_interval=0.0005)
+    # The bot is fast; play on until the sampler has caught some of its stacks
+    for _ in range(50):
+        play_single_game(profiler, RandomPlayer(), chess.WHITE)
+        if profiler.stacks:
+            break
+    stats_path, collapsed_path = profiler.save(tmp_path, "hybrid")
+    assert any(func == 'chess_bot_hybrid' for _, _, func in pstats.Stats(str(stats_path)).stats)
+    assert any('hybrid_bot.py' in line for line in profiler.hot_functions(paths=('hybrid_bot',)))
+    stacks = collapsed_path.read_text().splitlines()
+    assert stacks and all(line.startswith('chess_bot_hybrid (hybrid_bot.py:') for line in stacks)
+
+
+def test_parallel_games_are_ordered_and_seeded():
+    """Pooled games come back in spec order, and the same seeds replay the same games"""
+    from submission.bots.basic_bot import chess_bot_basic
+
+    specs = match_specs(random_games=4, stockfish_games=0, seed=7)
+    assert [s.index for s in specs] == [0, 1, 2, 3] and len({s.seed for s in specs}) == 4
+    recorder = LatencyRecorder(chess_bot_basic)
+    first = play_games(chess_bot_basic, specs, workers=2, recorder=recorder)
+    again = play_games(chess_bot_basic, specs, workers=2)
+    assert [r.final_fen for r in first] == [r.final_fen for r in again]
+    assert [r.moves for r in first] == [r.moves for r in again]
+    assert len(recorder.samples) == sum((r.moves + 1) // 2 if s.bot_color == chess.WHITE else r.moves // 2
+                                        for r, s in zip(first, specs))
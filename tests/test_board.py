@@ -0,0 +1,86 @@
+# tests/test_board.py
+import random
+
+import chess
+import pytest
+
+from submission.engine.board import Position, move_to_uci
+
+PERFT_POSITIONS = [
+    (chess.STARTING_FEN, 3, 8902),
+    ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 2, 2039),
+    ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 3, 2812),
+    ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", 3, 9467),
+    ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 2, 1486),
+]
+
+
+def perft(position: Position, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in position.pseudo_legal_moves():
+        if position.make(move):
+            nodes += perft(position, depth - 1)
+            position.unmake()
+    return nodes
+
+
+@pytest.mark.parametrize("fen,depth,expected", PERFT_POSITIONS)
+def test_perft(fen, depth, expected):
+    """Move generation matches the published perft node counts"""
+    position = Position(fen)
+    assert perft(position, depth) == expected
+    assert position.fen() == fen, "make/unmake did not restore the position"
+
+
+def test_legal_moves_match_python_chess(sample_positions):
+    """Legal moves, check/mate detection, keys and eval terms stay right over random games"""
+    rng = random.Random(0)
+    for fen in sample_positions:
+        board = chess.Board(fen)
+        position = Position(fen)
+        for _ in range(60):
+            if board.is_game_over():
+                break
+            expected = sorted(m.uci() for m in board.legal_moves)
+            assert sorted(move_to_uci(m) for m in position.legal_moves()) == expected, board.fen()
+            assert position.in_check() == board.is_check()
+            assert position.key == position.compute_key(), "incremental Zobrist key drifted"
+            assert position.pawn_key == position.compute_pawn_key(), "incremental pawn key drifted"
+            assert (position.mg, position.eg, position.phase) == position.compute_eval()
+            uci = rng.choice(expected)
+            board.push_uci(uci)
+            assert position.make(position.parse_uci(uci))
+        assert position.is_checkmate() == board.is_checkmate()
+        assert position.is_stalemate() == board.is_stalemate()
+
+
+def test_pseudo_legal_check_matches_generation():
+    """is_pseudo_legal() accepts exactly the generated moves, including moves from other positions"""
+    positions = [Position(fen) for fen, _, _ in PERFT_POSITIONS]
+    pool = {move for position in positions for move in position.pseudo_legal_moves()}
+    for position in positions:
+        generated = set(position.pseudo_legal_moves())
+        assert generated == {m for m in pool | generated if position.is_pseudo_legal(m)}
+
+
+def test_illegal_move_is_rejected():
+    """make() refuses moves that leave the king in check and leaves the position untouched"""
+    fen = "4k3/4r3/8/8/8/8/8/4K3 w - - 0 1"
+    position = Position(fen)
+    assert not position.make(position.parse_uci("e1e2"))
+    assert position.fen() == fen
+    assert position.make(position.parse_uci("e1d1"))
+
+
+def test_transpositions_share_a_key():
+    """Move orders reaching the same position produce the same key"""
+    a, b = Position(), Position()
+    for uci in ("g1f3", "g8f6", "b1c3", "b8c6"):
+        a.make(a.parse_uci(uci))
+    for uci in ("b1c3", "b8c6", "g1f3", "g8f6"):
+        b.make(b.parse_uci(uci))
+    assert a.key == b.key
+    # An en passant square nobody can capture on does not change the key
+    assert Position("4k3/8/8/8/4P3/8/8/4K3 b - e3 0 1").key == Position("4k3/8/8/8/4P3/8/8/4K3 b - - 0 1").key
@@ -0,0 +1,357 @@
+# tests/test_search.py
+import logging
+import time
+
+import chess
+import pytest
+
+from submission.engine.board import Position, NO_MOVE, move_to_uci
+from submission.engine.search import Searcher, MATE_BOUND, CHECK_EVERY
+from submission.engine.see import see
+from submission.engine.tt import TranspositionTable, EXACT, LOWER
+
+
+@pytest.mark.parametrize("fen,best", [
+    ("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1", "d1d8"),  # back-rank mate in 1
+    ("r2qkb1r/pp2nppp/3p4/2pNN1B1/2BnP3/3P4/PPP2PPP/R2bK2R w KQkq - 1 1", "d5f6"),  # mate in 2
+])
+def test_search_finds_mate(fen, best):
+    """Forced mates are found and scored as mates"""
+    move, score, _ = Searcher().search(Position(fen), time_limit=2.0)
+    assert move_to_uci(move) == best
+    assert score >= MATE_BOUND
+
+
+def test_search_wins_hanging_queen():
+    """A free queen is captured"""
+    position = Position("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+    move, _, _ = Searcher().search(position, time_limit=0.5)
+    assert move_to_uci(move) == "d2d5"
+
+
+@pytest.mark.parametrize("fen,uci,expected", [
+    ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", "e1e5", 100),  # undefended pawn
+    ("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", "d3e5", -220),  # x-rays on both sides
+    ("3rk3/3r4/8/3p4/8/8/3R4/3RK3 w - - 0 1", "d2d5", -400),  # doubled rooks recapture
+    ("4k3/4r3/8/3pK3/8/8/8/8 w - - 0 1", "e5d5", 100),  # king captures an undefended pawn
+    ("r3k3/1P6/8/8/8/8/8/4K3 w - - 0 1", "b7b8q", -100),  # promotion square is covered
+])
+def test_static_exchange_evaluation(fen, uci, expected):
+    """SEE resolves the whole capture sequence on the target square"""
+    position = Position(fen)
+    assert see(position, position.parse_uci(uci)) == expected
+
+
+def test_quiescence_sees_recaptures():
+    """A one-ply search does not grab a pawn defended by a pawn"""
+    position = Position("4k3/8/4p3/3p4/8/8/8/3QK3 w - - 0 1")
+    move, score, _ = Searcher().search(position, time_limit=5.0, max_depth=1)
+    assert move_to_uci(move) != "d1d5"
+    assert score > -300
+
+
+def test_search_respects_node_budget():
+    """Quiescence nodes count against the same budget as the main search"""
+    searcher = Searcher()
+    position = Position("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    move, _, _ = searcher.search(position, time_limit=10.0, max_nodes=2000)
+    assert move in position.legal_moves()
+    assert searcher.nodes <= 2000 + CHECK_EVERY + 1  # polled every CHECK_EVERY nodes
+
+
+def test_search_respects_deadline(sample_positions):
+    """The search returns a legal move within its budget and restores the position"""
+    searcher = Searcher()
+    for fen in sample_positions:
+        position = Position(fen)
+        start = time.perf_counter()
+        move, _, _ = searcher.search(position, time_limit=0.05)
+        assert time.perf_counter() - start < 0.1
+        assert move in position.legal_moves()
+        assert position.fen() == fen
+
+
+def test_tt_fixed_size_and_replacement():
+    """The table stays within its byte budget and keeps deep entries from the current search"""
+    tt = TranspositionTable(size_bytes=64 * 1024)
+    assert tt.size_bytes <= 64 * 1024
+    buckets = tt.mask + 1
+    deep, shallow, other = 5, 5 + buckets, 5 + 2 * buckets  # same bucket
+    tt.store(deep, 123, -40, 8, EXACT)
+    tt.store(shallow, 456, 10, 2, LOWER)
+    tt.store(other, 789, 20, 1, LOWER)  # evicts the always-replace slot
+    assert tt.probe(deep) == (123, -40, 8, EXACT)
+    assert tt.probe(shallow) is None
+    assert tt.probe(other) == (789, 20, 1, LOWER)
+    tt.new_search()
+    tt.store(shallow, 456, 10, 2, LOWER)  # aged entries lose depth priority
+    assert tt.probe(shallow) == (456, 10, 2, LOWER)
+    stats = tt.stats()
+    assert stats['stores'] == 4 and stats['collision_rate'] > 0
+
+
+def test_game_state_follows_the_game():
+    """The agent replays the opponent's move on its own board and resets on a new game"""
+    from submission.engine.game import GameState
+
+    state = GameState()
+    board = chess.Board()
+    move, _, _ = state.play(board.fen(), 0.02)
+    board.push_uci(move_to_uci(move))
+    board.push_uci(next(m.uci() for m in board.legal_moves))
+    pos = state.sync(board.fen())
+    assert state.games == 1 and state.opponent_move
+    assert len(pos.history) >= 1 and pos.key == Position(board.fen()).key
+
+    state.sync(chess.STARTING_FEN)
+    assert state.games == 2 and not state.pos.history
+
+
+def test_repetition_detection():
+    """Positions repeated since the last irreversible move are detected"""
+    position = Position("4k3/8/8/8/8/8/8/4KQ2 w - - 0 1")
+    for uci in ("f1f2", "e8d8", "f2f1", "d8e8"):
+        position.make(position.parse_uci(uci))
+    assert position.is_repetition()
+    position.make(position.parse_uci("e1d1"))
+    assert not position.is_repetition()
+
+
+def test_move_ordering_stages():
+    """TT move first, then winning captures, killers, history-ordered quiets, losing captures"""
+    from submission.engine.ordering import MoveOrderer
+
+    position = Position("4k3/8/4p3/3p4/8/2n5/8/3QK2N w - - 0 1")
+    orderer = MoveOrderer()
+    tt_move = position.parse_uci("e1f2")
+    killer = position.parse_uci("h1g3")
+    orderer.cutoff(position, killer, depth=4, ply=0, tried=[])
+    moves = [move_to_uci(m) for m in orderer.order(position, tt_move, ply=0)]
+    assert sorted(moves) == sorted(move_to_uci(m) for m in position.pseudo_legal_moves())
+    assert moves[:2] == ["e1f2", "h1g3"]
+    assert moves[-1] == "d1d5"  # queen takes a defended pawn
+    orderer.new_search()
+    assert not any(orderer.killers)
+
+
+def test_tried_buffers_and_array_pv():
+    """Tried quiets live in reused per-ply buffers; the PV is a legal array('H') line"""
+    from array import array
+    from submission.engine.ordering import MoveOrderer, MAX_MOVES
+
+    fen = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+    searcher = Searcher()
+    buffers = [id(b) for b in searcher.orderer.tried]
+    searcher.search(Position(fen), time_limit=1.0, max_depth=4)
+    searcher.search(Position(fen), time_limit=1.0, max_depth=4)
+    assert [id(b) for b in searcher.orderer.tried] == buffers
+    assert all(len(b) == MAX_MOVES for b in searcher.orderer.tried)
+    assert isinstance(searcher.pv, array) and searcher.pv.typecode == 'H' and len(searcher.pv) >= 2
+    board = chess.Board(fen)
+    for move in searcher.pv:
+        board.push_uci(move_to_uci(move))  # raises on an illegal move
+
+    # A cutoff takes a slice of the buffer and penalises the quiets tried before the cutoff move
+    position = Position(fen)
+    orderer = MoveOrderer()
+    tried = orderer.tried[0]
+    tried[0], tried[1] = position.parse_uci("a2a3"), position.parse_uci("h2h3")
+    orderer.cutoff(position, position.parse_uci("b1c3"), depth=3, ply=0, tried=tried[:2])
+    moves = [move_to_uci(m) for m in orderer.order(position, NO_MOVE, ply=0)]
+    quiets = [m for m in moves if m not in ("f3e5",)]  # the only capture, a losing one
+    assert quiets[0] == "b1c3" and sorted(quiets[-2:]) == ["a2a3", "h2h3"]
+
+
+def test_staged_generation_is_lazy():
+    """A cutoff on the TT move or a capture, or a legal capture for has_legal_move(), never generates the quiet moves"""
+    from submission.engine.ordering import MoveOrderer
+
+    position = Position("4k3/8/4p3/3p4/8/8/3n4/3QK2N w - - 0 1")
+    generated = []
+    position.gen_quiet = generated.append
+    staged = MoveOrderer().staged(position, position.parse_uci("e1f2"), ply=0)
+    assert move_to_uci(next(staged)) == "e1f2"
+    assert move_to_uci(next(staged)) == "d1d2"  # winning capture
+    staged.close()
+    assert position.has_legal_move()
+    assert not generated
+
+
+def test_opening_book():
+    """Book entries are found by key, capped in size, and played without searching"""
+    from submission.engine.book import OpeningBook, build_book, RECORD
+    from submission.engine.game import GameState
+
+    start = Position(chess.STARTING_FEN)
+    e4, d4 = start.parse_uci("e2e4"), start.parse_uci("d2d4")
+    start.make(e4)
+    c5 = start.parse_uci("c7c5")
+    weights = {(Position(chess.STARTING_FEN).key, e4): 5,
+               (Position(chess.STARTING_FEN).key, d4): 3,
+               (start.key, c5): 1}
+    book = OpeningBook(build_book(weights))
+    assert book.lookup(Position(chess.STARTING_FEN).key) == [(e4, 5), (d4, 3)]
+    assert book.lookup(start.key) == [(c5, 1)]
+    assert book.lookup(12345) == []
+    assert len(build_book(weights, max_bytes=2 * RECORD.size)) == 2 * RECORD.size
+
+    state = GameState(book=book)
+    move, _, depth = state.play(chess.STARTING_FEN, 0.02)
+    assert move in (e4, d4) and depth == 0
+
+    shipped = OpeningBook()
+    assert shipped.size and shipped.choose(Position(chess.STARTING_FEN))
+
+
+@pytest.mark.parametrize("fen,expected", [
+    ("3k4/8/3K4/3P4/8/8/8/8 w - - 0 1", (1, None)),           # king on the sixth in front of the pawn
+    ("3k4/8/3K4/3P4/8/8/8/8 b - - 0 1", (-1, None)),
+    ("4k3/4P3/4K3/8/8/8/8/8 b - - 0 1", (0, 0)),              # stalemate
+    ("4k3/4P3/4K3/8/8/8/8/8 w - - 0 1", (1, None)),           # Kd6 Kf7 Kd7 promotes
+    ("7k/8/7K/7P/8/8/8/8 w - - 0 1", (0, 0)),                 # rook pawn
+    ("8/8/8/8/8/4k3/4p3/4K3 w - - 0 1", (0, 0)),              # colors reversed
+    ("k7/8/1K6/8/8/8/8/7Q b - - 0 1", (-1, 2)),               # mated after one queen move
+    ("k7/8/1K6/8/8/8/8/6Q1 w - - 0 1", (1, 1)),               # mate in one
+    ("8/8/8/8/8/8/1k6/Rr2K3 w - - 0 1", None),                # four pieces: not covered
+    ("8/8/8/4k3/8/8/8/2N1K3 w - - 0 1", (0, 0)),              # lone minor piece
+])
+def test_bitbase_probe(fen, expected):
+    """Bitbase results for known endings, from the side to move's point of view"""
+    from submission.engine.bitbase import probe
+
+    assert probe(Position(fen)) == expected
+
+
+def test_search_uses_bitbases():
+    """Trivial endings are scored as exact mates instead of searched out"""
+    from submission.engine.bitbase import probe
+    from submission.engine.search import Searcher, MATE
+
+    position = Position("8/8/8/3k4/8/8/8/R3K3 w - - 0 1")
+    move, score, depth = Searcher().search(position, 1.0)
+    assert depth == 1 and MATE - score == probe(position)[1]
+
+
+@pytest.mark.parametrize("fen", [
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "4k3/8/8/2pP4/8/8/8/B3K2R w K c6 0 1",    # discovered check by en passant, castling check
+    "4k3/1P6/8/8/8/8/8/R3K3 w - - 0 1",        # promotions with and without check
+])
+def test_checking_moves(fen):
+    """The attack-map filter finds exactly the checking moves"""
+    from submission.engine.mate import checking_moves
+
+    board = chess.Board(fen)
+    expected = sorted(m.uci() for m in board.legal_moves if board.gives_check(m))
+    assert sorted(move_to_uci(m) for m in checking_moves(Position(fen))) == expected
+
+
+def test_mate_finder():
+    """Mates in one among all legal moves, and mates in two by checks"""
+    from submission.engine.mate import find_mate_in_one, find_mate_in_two
+
+    position = Position("6k1/5ppp/8/8/8/8/PPPPPPPP/RNBQK2R w KQ - 0 1")
+    assert not find_mate_in_one(position)
+    position = Position("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+    assert move_to_uci(find_mate_in_one(position)) == "a1a8"
+    position = Position("r2qkb1r/pp2nppp/3p4/2pNN1B1/2BnP3/3P4/PPP2PPP/R2bK2R w KQkq - 1 1")
+    assert not find_mate_in_one(position)
+    assert move_to_uci(find_mate_in_two(position)) == "d5f6"
+    # d5f6+ has a single reply: a budget of one node proves the mate, none proves nothing
+    assert move_to_uci(find_mate_in_two(position, max_nodes=1)) == "d5f6"
+    assert not find_mate_in_two(position, max_nodes=0)
+
+    # Played mates carry their distance, as the search would score them
+    from submission.engine.game import GameState
+    from submission.engine.search import MATE
+    assert GameState().play("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1", 0.02)[1:] == (MATE - 1, 0)
+    assert GameState().play(position.fen(), 0.02)[1:] == (MATE - 3, 0)
+
+
+def test_pawn_structure_and_hash():
+    """Doubled, isolated and passed pawns and file masks, cached under the pawn key"""
+    from submission.engine.pawns import PawnTable, pawn_structure, PASSED_MG, PASSED_EG, \
+        DOUBLED_MG, ISOLATED_MG
+
+    # White: doubled, isolated a-pawns of which only the front one is passed,
+    # and an isolated passed d-pawn; Black: connected passed pawns on their
+    # starting squares
+    position = Position("4k3/5pp1/8/3P4/P7/P7/8/4K3 w - - 0 1")
+    mg, eg, open_files, semi_white, semi_black = pawn_structure(position.bb[0], position.bb[6])
+    assert mg == (-DOUBLED_MG - 3 * ISOLATED_MG
+                  + PASSED_MG[3] + PASSED_MG[4] - 2 * PASSED_MG[1])
+    assert open_files == 0b10010110  # b, c, e, h
+    assert semi_white == open_files | 0b01100000 and semi_black == open_files | 0b00001001
+
+    table = PawnTable()
+    assert table.probe(position) == (mg, eg, open_files, semi_white, semi_black)
+    assert table.probe(position) == (mg, eg, open_files, semi_white, semi_black)
+    assert table.stats()['hit_rate'] == 0.5
+    assert PASSED_EG[4] > 0
+
+
+def test_evaluation_is_color_symmetric():
+    """Mirroring the board and swapping colors leaves the side-to-move score unchanged"""
+    from submission.engine.evaluate import evaluate
+
+    board = chess.Board("r1bq1rk1/pp3ppp/2n1pn2/3p4/2PP4/P1N1PN2/1P3PPP/R2QKB1R w KQ - 0 9")
+    assert evaluate(Position(board.fen())) == evaluate(Position(board.mirror().fen()))
+
+
+def test_time_manager_budgets():
+    """Budgets read the Kaggle clock, shrink with the bank and keep the reserve"""
+    from types import SimpleNamespace
+    from submission.engine.timeman import read_clock, allocate, RESERVE
+
+    assert read_clock({'board': '...'}) == (None, 0, 0.1)
+    obs = SimpleNamespace(remainingOverageTime=8, step=20)
+    assert read_clock(obs, {'actTimeout': 0.2}) == (8.0, 20, 0.2)
+
+    soft, hard = allocate(None, 0)
+    assert hard <= 0.1 and soft < hard
+    assert allocate(RESERVE * 0.5, 40) == (soft, hard)
+    soft, hard = allocate(10.0, 0)
+    assert 0.1 < soft < hard <= 0.1 + (10.0 - RESERVE) * 0.15
+    assert allocate(3.0, 0)[1] < hard
+
+
+def test_search_soft_limit():
+    """No depth starts that would run far past the soft limit, however long the hard limit is"""
+    position = Position("r1bq1rk1/pp3ppp/2n1pn2/3p4/2PP4/P1N1PN2/1P3PPP/R2QKB1R w KQ - 0 9")
+    start = time.perf_counter()
+    Searcher().search(position, time_limit=1.0, soft_limit=0.02)
+    assert time.perf_counter() - start < 0.1
+
+
+def test_aborted_iteration_keeps_root_move():
+    """A depth cut off by the budget still plays its best fully searched root move"""
+    fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    position = Position(fen)
+    searcher = Searcher()
+    move, score, depth = searcher.search(position, time_limit=10.0, max_nodes=20000)
+    assert searcher.root_move and depth == len(searcher.iterations)
+    assert (move, score) == (searcher.root_move, searcher.root_score)
+    assert position.fen() == fen
+
+
+def test_dispatcher_switches_with_the_clock(caplog):
+    """The search runs while time allows; rule-based bots take over as the bank runs out"""
+    from submission.bots.dispatch_bot import Dispatcher, choose_strategy, piece_count
+
+    start = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+    assert piece_count(start) == 32
+    assert choose_strategy(None, 32) == choose_strategy(5.0, 32) == 'search'
+    assert choose_strategy(0.8, 32) == 'hybrid' and choose_strategy(0.8, 4) == 'search'
+    assert choose_strategy(0.1, 4) == 'basic'
+    # A running search is not dropped just above the piece threshold
+    assert choose_strategy(0.8, 12, 'hybrid') == 'hybrid' and choose_strategy(0.8, 12, 'search') == 'search'
+    assert choose_strategy(0.8, 13, 'search') == 'hybrid'
+
+    dispatcher = Dispatcher()
+    with caplog.at_level(logging.WARNING):
+        for step, bank in ((0, 10.0), (2, 0.8), (4, 0.1)):
+            uci = dispatcher({'board': start, 'step': step, 'remainingOverageTime': bank})
+            assert chess.Move.from_uci(uci) in chess.Board(start).legal_moves
+    assert dispatcher.switches == [(2, 'search', 'hybrid'), (4, 'hybrid', 'basic')]
+    assert ["search -> hybrid" in r.message for r in caplog.records] == [True, False]
@@ -4,10 +4,19 @@ import chess.engine
 import time
 import random
 import json
+import math
+import signal
+import pstats
+import cProfile
+import inspect
+import tracemalloc
 import dataclasses
+from collections import Counter
 from typing import Dict, List, Optional
 from pathlib import Path
 
+from .harness import call_agent
+
 @dataclasses.dataclass
 class GameResult:
     winner: str
@@ -15,6 +24,23 @@ class GameResult:
     time_taken: float
     ending: str
     final_fen: str
+    bot_time_left: Optional[float] = None  # overage bank at the end, clocked games only
+
+# Kaggle chess clock: a bank of overage time per side, and a per-move
+# allowance (actTimeout) that is not charged to it
+KAGGLE_OVERAGE_TIME = 10.0
+KAGGLE_ACT_TIMEOUT = 0.1
+
+@dataclasses.dataclass
+class KaggleClock:
+    """One side's clock, charged the way the Kaggle environment does"""
+    remaining: float = KAGGLE_OVERAGE_TIME
+    increment: float = KAGGLE_ACT_TIMEOUT
+
+    def charge(self, elapsed: float) -> bool:
+        """Take the time beyond the increment from the bank; False once it has run out"""
+        self.remaining -= max(0.0, elapsed - self.increment)
+        return self.remaining >= 0
 
 @dataclasses.dataclass
 class TestSession:
@@ -25,6 +51,8 @@ class TestSession:
     stockfish_results: List[GameResult]
     memory_usage: float
     avg_move_time: float
+    memory_profile: Optional[Dict] = None  # MemoryProfiler.summary()
+    latency: Optional[Dict] = None  # LatencyRecorder.report()
 
     def save(self, directory: Path):
         output = dataclasses.asdict(self)
@@ -34,6 +62,185 @@ class TestSession:
             json.dump(output, f, indent=2)
 
 
+@dataclasses.dataclass
+class MoveMemory:
+    """Allocations made by the bot during one move"""
+    fen: str
+    peak: int  # highest traced size during the move, bytes
+    net: int  # bytes allocated during the move and still alive after it
+    top: List[str]  # largest surviving allocations as "file:line: size"
+
+class MemoryProfiler:
+    """
+    Wraps a bot and traces every call with tracemalloc, recording the
+    per-move peak and net allocation and the top allocating source lines.
+    Tracing runs only inside bot calls, so it costs nothing in between.
+    """
+
+    def __init__(self, bot_func, top_lines: int = 5):
+        self.bot_func = bot_func
+        self.top_lines = top_lines
+        self.moves: List[MoveMemory] = []
+
+    def __call__(self, obs: Dict, config: Optional[Dict] = None) -> str:
+        tracemalloc.start()
+        try:
+            return call_agent(self.bot_func, obs, config)
+        finally:
+            net, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, inspect.__file__)])
+            tracemalloc.stop()
+            top = [f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}: {stat.size}"
+                   for stat in snapshot.statistics('lineno')[:self.top_lines]]
+            self.moves.append(MoveMemory(fen=obs['board'], peak=peak, net=net, top=top))
+
+    def summary(self, worst: int = 5) -> Dict:
+        """Peak and net figures over all moves, with the heaviest moves in full"""
+        if not self.moves:
+            return {'moves': 0}
+        by_peak = sorted(self.moves, key=lambda m: m.peak, reverse=True)
+        return {
+            'moves': len(self.moves),
+            'max_peak': by_peak[0].peak,
+            'mean_peak': sum(m.peak for m in self.moves) / len(self.moves),
+            'max_net': max(m.net for m in self.moves),
+            'total_net': sum(m.net for m in self.moves),
+            'worst_moves': [dataclasses.asdict(m) for m in by_peak[:worst]],
+        }
+
+
+def percentile(sorted_values: List[int], p: float) -> int:
+    """Nearest-rank percentile of an ascending list"""
+    return sorted_values[max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))]
+
+def game_phase(board: chess.Board) -> str:
+    """Opening for the first moves, endgame once few pieces remain, middlegame otherwise"""
+    if len(board.piece_map()) <= 12:
+        return 'endgame'
+    return 'opening' if board.fullmove_number <= 12 else 'middlegame'
+
+def piece_bucket(board: chess.Board) -> str:
+    """Piece count in buckets of eight: '2-8', '9-16', '17-24', '25-32'"""
+    high = max(8, -(-len(board.piece_map()) // 8) * 8)
+    return f"{high - 7 if high > 8 else 2}-{high}"
+
+class LatencyRecorder:
+    """
+    Wraps a bot and times every call with perf_counter_ns, for latency
+    percentiles by game phase and piece count and a list of the moves
+    over a time budget.
+    """
+
+    def __init__(self, bot_func, budget: float = KAGGLE_ACT_TIMEOUT):
+        self.bot_func = bot_func
+        self.budget_ns = int(budget * 1e9)
+        self.samples: List[tuple] = []  # (ns, fen)
+
+    def __call__(self, obs: Dict, config: Optional[Dict] = None) -> str:
+        start = time.perf_counter_ns()
+        try:
+            return call_agent(self.bot_func, obs, config)
+        finally:
+            self.samples.append((time.perf_counter_ns() - start, obs['board']))
+
+    @staticmethod
+    def _distribution(times: List[int]) -> Dict:
+        times = sorted(times)
+        return {
+            'moves': len(times),
+            'p50_ms': percentile(times, 50) / 1e6,
+            'p90_ms': percentile(times, 90) / 1e6,
+            'p99_ms': percentile(times, 99) / 1e6,
+            'max_ms': times[-1] / 1e6,
+        }
+
+    def report(self, worst: int = 5) -> Dict:
+        """Overall, per-phase and per-piece-count percentiles, budget violations and worst FENs"""
+        if not self.samples:
+            return {'moves': 0}
+        by_phase: Dict[str, List[int]] = {}
+        by_pieces: Dict[str, List[int]] = {}
+        for ns, fen in self.samples:
+            board = chess.Board(fen)
+            by_phase.setdefault(game_phase(board), []).append(ns)
+            by_pieces.setdefault(piece_bucket(board), []).append(ns)
+        slowest = sorted(self.samples, reverse=True)
+        return {
+            **self._distribution([ns for ns, _ in self.samples]),
+            'budget_ms': self.budget_ns / 1e6,
+            'over_budget': sum(1 for ns, _ in self.samples if ns > self.budget_ns),
+            'by_phase': {k: self._distribution(v) for k, v in sorted(by_phase.items())},
+            'by_pieces': {k: self._distribution(v) for k, v in sorted(by_pieces.items())},
+            'worst': [{'ms': ns / 1e6, 'fen': fen} for ns, fen in slowest[:worst]],
+        }
+
+
+# Source paths reported by BotProfiler.hot_functions(): our bots and engine, and Chessnut
+HOT_PATHS = ('basic_bot', 'hybrid_bot', 'submission', 'Chessnut')
+
+class BotProfiler:
+    """
+    Opt-in profiler around bot calls. Each call runs under cProfile and a
+    SIGPROF stack sampler; both accumulate over every call, so one
+    profiler merges all the games it is used in. save() writes a pstats
+    file and a collapsed-stack file for flamegraph tools.
+    """
+
+    def __init__(self, bot_func, sample_interval: float = 0.001):
+        self.bot_func = bot_func
+        self.sample_interval = sample_interval
+        self.profile = cProfile.Profile()
+        self.stacks: Counter = Counter()
+        self.calls = 0
+
+    def _sample(self, signum, frame):
+        stack = []
+        # Stacks start at the bot: stop at the call_agent frame that called it.
+        # Samples landing outside the bot (before or after the call) are dropped.
+        while frame is not None and frame.f_code is not call_agent.__code__:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+            frame = frame.f_back
+        if frame is not None and stack:
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def __call__(self, obs: Dict, config: Optional[Dict] = None) -> str:
+        self.calls += 1
+        previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.sample_interval, self.sample_interval)
+        self.profile.enable()
+        try:
+            return call_agent(self.bot_func, obs, config)
+        finally:
+            self.profile.disable()
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, previous)
+
+    def save(self, directory: Path, name: str) -> List[Path]:
+        """Write <name>.pstats and <name>.collapsed into `directory`"""
+        directory.mkdir(parents=True, exist_ok=True)
+        stats_path = directory / f"{name}.pstats"
+        collapsed_path = directory / f"{name}.collapsed"
+        self.profile.dump_stats(stats_path)
+        with open(collapsed_path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return [stats_path, collapsed_path]
+
+    def hot_functions(self, limit: int = 15, paths=HOT_PATHS) -> List[str]:
+        """The functions with the most own time among source files matching `paths`"""
+        if not self.calls:
+            return []
+        entries = []
+        for (filename, line, func), (_, ncalls, tottime, cumtime, _) in pstats.Stats(self.profile).stats.items():
+            if any(p in filename for p in paths):
+                entries.append((tottime, cumtime, ncalls, f"{Path(filename).name}:{line}({func})"))
+        entries.sort(reverse=True)
+        return [f"{tt * 1000:8.1f} ms own {ct * 1000:8.1f} ms cum {n:8d} calls  {where}"
+                for tt, ct, n, where in entries[:limit]]
+
+
 class RandomPlayer:
     def get_move(self, board: chess.Board) -> chess.Move:
         """Simple random move selector"""
@@ -53,8 +260,24 @@ class StockfishPlayer:
     def __del__(self):
         self.engine.quit()
 
-def play_single_game(bot_func, opponent, bot_color: chess.Color) -> GameResult:
-    """Play a single game and return detailed results"""
+def kaggle_observation(board: chess.Board, clock: KaggleClock) -> Dict:
+    """Observation in the shape the Kaggle chess environment sends to the side to move"""
+    return {
+        'board': board.fen(),
+        'mark': 'white' if board.turn == chess.WHITE else 'black',
+        'step': len(board.move_stack),
+        'remainingOverageTime': clock.remaining,
+    }
+
+def play_single_game(bot_func, opponent, bot_color: chess.Color,
+                     clocks: Optional[Dict[chess.Color, KaggleClock]] = None) -> GameResult:
+    """
+    Play a single game and return detailed results.
+
+    With `clocks` (one KaggleClock per color) the bot gets Kaggle-shaped
+    observations, both sides are charged for their thinking time, and a
+    side whose bank runs out loses on time.
+    """
     board = chess.Board()
     moves = 0
     start_time = time.time()
@@ -63,13 +286,28 @@ def play_single_game(bot_func, opponent, bot_color: chess.Color) -> GameResult:
         is_bot_turn = (board.turn == bot_color)
         
         try:
+            move_start = time.perf_counter()
             if is_bot_turn:
-                obs = {'board': board.fen()}
-                move = bot_func(obs)
+                if clocks is None:
+                    obs = {'board': board.fen()}
+                    move = bot_func(obs)
+                else:
+                    clock = clocks[board.turn]
+                    obs = kaggle_observation(board, clock)
+                    move = call_agent(bot_func, obs, {'actTimeout': clock.increment})
                 board.push_uci(move)
             else:
                 move = opponent.get_move(board)
                 board.push(move)
+            if clocks is not None and not clocks[not board.turn].charge(time.perf_counter() - move_start):
+                return GameResult(
+                    winner='opponent' if is_bot_turn else 'bot',
+                    moves=moves + 1,
+                    time_taken=time.time() - start_time,
+                    ending='timeout',
+                    final_fen=board.fen(),
+                    bot_time_left=clocks[bot_color].remaining
+                )
                 
             moves += 1
             
@@ -108,7 +346,8 @@ def play_single_game(bot_func, opponent, bot_color: chess.Color) -> GameResult:
         moves=moves,
         time_taken=time.time() - start_time,
         ending=ending,
-        final_fen=board.fen()
+        final_fen=board.fen(),
+        bot_time_left=None if clocks is None else clocks[bot_color].remaining
     )
 
 def measure_memory_usage(bot_func, num_moves: int = 10) -> float:
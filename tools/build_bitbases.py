@@ -0,0 +1,167 @@
+# tools/build_bitbases.py
+"""
+Generate submission/engine/bitbases.bin by retrograde analysis.
+
+KPK is solved to win/draw, KRK and KQK to distance to mate. The index
+layout and the lone-king lookups are the engine's own (engine.bitbase),
+so the tables are probed exactly as they were built.
+
+    python tools/build_bitbases.py
+"""
+import sys
+import lzma
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'submission'))
+
+from engine.board import WHITE, KING_ATTACKS, PAWN_ATTACKS, ROOK, QUEEN  # noqa: E402
+from engine.bitbase import (BITBASE_PATH, HEADER, TABLES, KPK_SIZE, PIECE_SIZE, PIECE_TABLES,  # noqa: E402
+                            TRIANGLE, kpk_index, piece_index)
+
+MAX_MOVES = 16  # longest mate that fits a nibble
+
+
+def squares(bb):
+    while bb:
+        low = bb & -bb
+        bb ^= low
+        yield low.bit_length() - 1
+
+
+def solve_kpk():
+    """One bit per position: 1 if the pawn side wins."""
+    wins = bytearray(KPK_SIZE)
+    legal = bytearray(KPK_SIZE)
+    children = [None] * KPK_SIZE
+    for i in range(KPK_SIZE):
+        bk, wk, rest = i & 63, (i >> 6) & 63, i >> 12
+        stm, p = divmod(rest, 24)
+        wp = (p // 4 + 1) * 8 + p % 4
+        if len({wk, wp, bk}) < 3 or KING_ATTACKS[wk] >> bk & 1:
+            continue
+        if stm == 0:
+            if PAWN_ATTACKS[WHITE][wp] >> bk & 1:
+                continue
+            legal[i] = 1
+            kids = [kpk_index(to, wp, bk, 1)
+                    for to in squares(KING_ATTACKS[wk] & ~KING_ATTACKS[bk] & ~(1 << wp))]
+            push = wp + 8
+            if push != wk and push != bk:
+                if push >= 56:
+                    # Promotes to a queen the lone king cannot take
+                    if not KING_ATTACKS[bk] >> push & 1 or KING_ATTACKS[wk] >> push & 1:
+                        wins[i] = 1
+                        continue
+                else:
+                    kids.append(kpk_index(wk, push, bk, 1))
+                    if wp < 16 and push + 8 != wk and push + 8 != bk:
+                        kids.append(kpk_index(wk, push + 8, bk, 1))
+        else:
+            legal[i] = 1
+            guarded = KING_ATTACKS[wk] | PAWN_ATTACKS[WHITE][wp]
+            moves = KING_ATTACKS[bk] & ~guarded
+            if not moves:
+                wins[i] = guarded >> bk & 1  # mated, else stalemate
+                continue
+            if moves >> wp & 1:
+                continue  # the pawn falls
+            kids = [kpk_index(wk, wp, to, 0) for to in squares(moves)]
+        children[i] = kids
+
+    changed = True
+    while changed:
+        changed = False
+        for i, kids in enumerate(children):
+            if kids is None or wins[i]:
+                continue
+            if (any(wins[k] for k in kids) if i < KPK_SIZE // 2 else all(wins[k] for k in kids)):
+                wins[i] = 1
+                changed = True
+
+    packed = bytearray(KPK_SIZE // 8)
+    win = 0
+    for i in range(KPK_SIZE):
+        # As for the piece tables, illegal positions repeat the last value
+        if legal[i]:
+            win = wins[i]
+        if win:
+            packed[i >> 3] |= 1 << (i & 7)
+    return bytes(packed), sum(wins)
+
+
+def solve_piece(piece):
+    """Distance to mate in moves, minus one, per nibble, strong side to move."""
+    _, attacks = PIECE_TABLES[piece]
+    wtm = [-1] * PIECE_SIZE  # plies to mate, strong side to move
+    btm = [-1] * PIECE_SIZE  # plies to mate, lone king to move
+    wtm_kids = [None] * PIECE_SIZE
+    btm_kids = [None] * PIECE_SIZE
+    for i in range(PIECE_SIZE):
+        wk, pc, bk = TRIANGLE[i >> 12], (i >> 6) & 63, i & 63
+        if len({wk, pc, bk}) < 3 or KING_ATTACKS[wk] >> bk & 1:
+            continue
+        occ = (1 << wk) | (1 << pc)
+        guarded = KING_ATTACKS[wk] | attacks(pc, occ)
+        # Lone king to move
+        moves = KING_ATTACKS[bk] & ~guarded
+        if not moves:
+            if guarded >> bk & 1:
+                btm[i] = 0
+        elif not moves >> pc & 1:
+            btm_kids[i] = [piece_index(wk, pc, to) for to in squares(moves)]
+        # Strong side to move, legal only if the lone king is not in check
+        if guarded >> bk & 1:
+            continue
+        kids = [piece_index(to, pc, bk)
+                for to in squares(KING_ATTACKS[wk] & ~KING_ATTACKS[bk] & ~(1 << pc))]
+        kids += [piece_index(wk, to, bk)
+                 for to in squares(attacks(pc, occ | (1 << bk)) & ~(1 << wk) & ~(1 << bk))]
+        wtm_kids[i] = kids
+
+    changed = True
+    while changed:
+        changed = False
+        for i, kids in enumerate(wtm_kids):
+            if kids is not None and wtm[i] < 0:
+                known = [btm[k] for k in kids if btm[k] >= 0]
+                if known:
+                    wtm[i] = min(known) + 1
+                    changed = True
+        for i, kids in enumerate(btm_kids):
+            if kids is not None and btm[i] < 0 and all(wtm[k] >= 0 for k in kids):
+                btm[i] = max(wtm[k] for k in kids) + 1
+                changed = True
+
+    packed = bytearray(PIECE_SIZE // 2)
+    longest = moves = 1
+    for i, kids in enumerate(wtm_kids):
+        if kids is not None:
+            assert wtm[i] > 0, f"unsolved position {i}"
+            moves = (wtm[i] + 1) // 2
+            assert moves <= MAX_MOVES, f"mate in {moves} does not fit"
+            longest = max(longest, moves)
+        # Illegal positions are never probed; repeating the last value
+        # keeps them from costing anything after compression
+        packed[i >> 1] |= (moves - 1) << ((i & 1) << 2)
+    return bytes(packed), longest
+
+
+def main():
+    kpk, wins = solve_kpk()
+    print(f"kpk: {wins} wins")
+    krk, longest = solve_piece(ROOK)
+    print(f"krk: longest mate in {longest}")
+    kqk, longest = solve_piece(QUEEN)
+    print(f"kqk: longest mate in {longest}")
+
+    blobs = dict(zip(TABLES, (lzma.compress(t, preset=9 | lzma.PRESET_EXTREME) for t in (kpk, krk, kqk))))
+    with open(BITBASE_PATH, 'wb') as f:
+        f.write(HEADER.pack(*(len(blobs[name]) for name in TABLES)))
+        for name in TABLES:
+            f.write(blobs[name])
+    print(f"{HEADER.size + sum(map(len, blobs.values()))} bytes -> {BITBASE_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+# tools/build_book.py
+"""
+Build submission/engine/book.bin from a set of opening lines.
+
+Every position along each line gets its move recorded with a weight equal
+to the number of lines (or PGN games) that played it. Keys come from the
+engine's own Position so they match what the bot hashes at runtime.
+
+    python tools/build_book.py                      # built-in repertoire
+    python tools/build_book.py --pgn games.pgn      # add PGN games
+    python tools/build_book.py --max-bytes 8192 --max-ply 12
+"""
+import argparse
+import sys
+from collections import Counter
+from pathlib import Path
+
+import chess
+import chess.pgn
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'submission'))
+
+from engine.board import Position, START_FEN  # noqa: E402
+from engine.book import BOOK_PATH, DEFAULT_MAX_BYTES, RECORD, build_book  # noqa: E402
+
+# Main lines of common openings, in SAN from the initial position
+REPERTOIRE = [
+    # Open games
+    "e4 e5 Nf3 Nc6 Bb5 a6 Ba4 Nf6 O-O Be7 Re1 b5 Bb3 d6 c3 O-O h3",
+    "e4 e5 Nf3 Nc6 Bb5 a6 Ba4 Nf6 O-O Nxe4 d4 b5 Bb3 d5 dxe5 Be6",
+    "e4 e5 Nf3 Nc6 Bb5 Nf6 O-O Nxe4 d4 Nd6 Bxc6 dxc6 dxe5 Nf5 Qxd8+ Kxd8",
+    "e4 e5 Nf3 Nc6 Bb5 a6 Bxc6 dxc6 O-O f6 d4 exd4 Nxd4 c5",
+    "e4 e5 Nf3 Nc6 Bc4 Bc5 c3 Nf6 d3 d6 O-O O-O Re1 a6",
+    "e4 e5 Nf3 Nc6 Bc4 Nf6 d3 Be7 O-O O-O Re1 d6 c3",
+    "e4 e5 Nf3 Nc6 d4 exd4 Nxd4 Nf6 Nxc6 bxc6 e5 Qe7 Qe2 Nd5",
+    "e4 e5 Nf3 Nc6 d4 exd4 Nxd4 Bc5 Be3 Qf6 c3 Nge7 Bc4",
+    "e4 e5 Nf3 Nf6 Nxe5 d6 Nf3 Nxe4 d4 d5 Bd3 Nc6 O-O Be7",
+    "e4 e5 Nf3 Nc6 Nc3 Nf6 Bb5 Bb4 O-O O-O d3 d6",
+    "e4 e5 Nc3 Nf6 f4 d5 fxe5 Nxe4 Nf3 Be7",
+    # Sicilian
+    "e4 c5 Nf3 d6 d4 cxd4 Nxd4 Nf6 Nc3 a6 Be3 e5 Nb3 Be6 f3 Be7",
+    "e4 c5 Nf3 d6 d4 cxd4 Nxd4 Nf6 Nc3 g6 Be3 Bg7 f3 O-O Qd2 Nc6",
+    "e4 c5 Nf3 Nc6 d4 cxd4 Nxd4 Nf6 Nc3 e5 Ndb5 d6 Bg5 a6 Na3 b5",
+    "e4 c5 Nf3 e6 d4 cxd4 Nxd4 Nc6 Nc3 Qc7 Be3 a6 Bd3 Nf6 O-O",
+    "e4 c5 Nf3 d6 Bb5+ Bd7 Bxd7+ Qxd7 O-O Nc6 c3 Nf6 Re1 e6",
+    "e4 c5 c3 Nf6 e5 Nd5 d4 cxd4 Nf3 Nc6 cxd4 d6",
+    "e4 c5 Nc3 Nc6 g3 g6 Bg2 Bg7 d3 d6 f4 e6 Nf3 Nge7",
+    # French, Caro-Kann and others against 1.e4
+    "e4 e6 d4 d5 Nc3 Nf6 e5 Nfd7 f4 c5 Nf3 Nc6 Be3 cxd4 Nxd4 Bc5",
+    "e4 e6 d4 d5 Nc3 Bb4 e5 c5 a3 Bxc3+ bxc3 Ne7 Qg4 Qc7",
+    "e4 e6 d4 d5 Nd2 Nf6 e5 Nfd7 Bd3 c5 c3 Nc6 Ne2 cxd4 cxd4 f6",
+    "e4 e6 d4 d5 e5 c5 c3 Nc6 Nf3 Qb6 a3 c4 Nbd2 Na5",
+    "e4 c6 d4 d5 Nc3 dxe4 Nxe4 Bf5 Ng3 Bg6 h4 h6 Nf3 Nd7 h5 Bh7",
+    "e4 c6 d4 d5 e5 Bf5 Nf3 e6 Be2 Ne7 O-O c5",
+    "e4 c6 d4 d5 exd5 cxd5 c4 Nf6 Nc3 e6 Nf3 Be7",
+    "e4 d5 exd5 Qxd5 Nc3 Qa5 d4 Nf6 Nf3 Bf5 Bc4 e6 Bd2 c6",
+    "e4 d6 d4 Nf6 Nc3 g6 Nf3 Bg7 Be2 O-O O-O c6",
+    "e4 g6 d4 Bg7 Nc3 d6 Be3 a6 Qd2 Nd7",
+    "e4 Nf6 e5 Nd5 d4 d6 Nf3 Bg4 Be2 e6 O-O Be7",
+    # Queen's Gambit and other 1.d4 d5
+    "d4 d5 c4 e6 Nc3 Nf6 Bg5 Be7 e3 O-O Nf3 h6 Bh4 b6",
+    "d4 d5 c4 e6 Nc3 Nf6 cxd5 exd5 Bg5 c6 e3 Be7 Bd3 Nbd7 Qc2 O-O",
+    "d4 d5 c4 e6 Nf3 Nf6 g3 dxc4 Bg2 a6 O-O b5",
+    "d4 d5 c4 c6 Nf3 Nf6 Nc3 dxc4 a4 Bf5 e3 e6 Bxc4 Bb4 O-O O-O",
+    "d4 d5 c4 c6 Nc3 Nf6 e3 e6 Nf3 Nbd7 Qc2 Bd6 Bd3 O-O O-O",
+    "d4 d5 c4 dxc4 Nf3 Nf6 e3 e6 Bxc4 c5 O-O a6",
+    "d4 d5 Nf3 Nf6 Bf4 c5 e3 Nc6 c3 Qb6 Qb3",
+    "d4 d5 Bf4 Nf6 e3 e6 Nf3 c5 c3 Nc6 Nbd2 Bd6 Bg3 O-O",
+    # Indian defences
+    "d4 Nf6 c4 e6 Nc3 Bb4 e3 O-O Bd3 d5 Nf3 c5 O-O Nc6",
+    "d4 Nf6 c4 e6 Nc3 Bb4 Qc2 O-O a3 Bxc3+ Qxc3 d5 Nf3",
+    "d4 Nf6 c4 e6 Nf3 b6 g3 Ba6 b3 Bb4+ Bd2 Be7 Bg2 c6",
+    "d4 Nf6 c4 e6 Nf3 d5 Nc3 Be7 Bf4 O-O e3 c5",
+    "d4 Nf6 c4 g6 Nc3 Bg7 e4 d6 Nf3 O-O Be2 e5 O-O Nc6 d5 Ne7",
+    "d4 Nf6 c4 g6 Nc3 d5 cxd5 Nxd5 e4 Nxc3 bxc3 Bg7 Nf3 c5 Be3",
+    "d4 Nf6 c4 g6 g3 Bg7 Bg2 O-O Nf3 d6 O-O Nbd7 Nc3 e5",
+    "d4 Nf6 c4 c5 d5 e6 Nc3 exd5 cxd5 d6 e4 g6 Nf3 Bg7",
+    "d4 Nf6 Nf3 e6 c4 b6 a3 Bb7 Nc3 d5 cxd5 Nxd5",
+    "d4 Nf6 Bg5 e6 e4 h6 Bxf6 Qxf6 Nc3 d6",
+    "d4 f5 g3 Nf6 Bg2 g6 Nf3 Bg7 O-O O-O c4 d6",
+    # Flank openings
+    "c4 e5 Nc3 Nf6 Nf3 Nc6 g3 d5 cxd5 Nxd5 Bg2 Nb6 O-O Be7",
+    "c4 Nf6 Nc3 e6 e4 d5 e5 d4 exf6 dxc3 bxc3 Qxf6",
+    "c4 c5 Nf3 Nf6 Nc3 Nc6 g3 g6 Bg2 Bg7 O-O O-O",
+    "c4 e6 Nc3 d5 d4 Nf6 Nf3 Be7 Bf4 O-O",
+    "Nf3 d5 g3 Nf6 Bg2 e6 O-O Be7 d3 O-O Nbd2 c5",
+    "Nf3 Nf6 c4 g6 Nc3 Bg7 e4 d6 d4 O-O Be2 e5",
+    "Nf3 c5 c4 Nc6 Nc3 e5 e3 Nf6 d4 exd4 exd4",
+    "g3 d5 Bg2 Nf6 Nf3 c6 O-O Bg4 d3 Nbd7",
+]
+
+
+def repertoire_games():
+    for line in REPERTOIRE:
+        board = chess.Board()
+        yield [board.push_san(san).uci() for san in line.split()]
+
+
+def pgn_games(path):
+    with open(path) as f:
+        while (game := chess.pgn.read_game(f)) is not None:
+            yield [move.uci() for move in game.mainline_moves()]
+
+
+def collect(games, max_ply):
+    """Count how often each (position key, move) pair occurs in `games`."""
+    weights = Counter()
+    for moves in games:
+        pos = Position(START_FEN)
+        for uci in moves[:max_ply]:
+            move = pos.parse_uci(uci)
+            weights[pos.key, move] += 1
+            if not pos.make(move):
+                raise ValueError(f"illegal move {uci} in {' '.join(moves)}")
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pgn', action='append', default=[], help='PGN file to add (repeatable)')
+    parser.add_argument('--max-ply', type=int, default=20, help='deepest ply to record')
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES, help='size cap of the book')
+    parser.add_argument('--min-weight', type=int, default=1, help='drop moves played fewer times')
+    parser.add_argument('-o', '--output', default=BOOK_PATH)
+    args = parser.parse_args()
+
+    weights = collect(repertoire_games(), args.max_ply)
+    for path in args.pgn:
+        weights.update(collect(pgn_games(path), args.max_ply))
+    weights = {entry: w for entry, w in weights.items() if w >= args.min_weight}
+
+    blob = build_book(weights, args.max_bytes)
+    with open(args.output, 'wb') as f:
+        f.write(blob)
+    print(f"{len(blob) // RECORD.size} of {len(weights)} entries, {len(blob)} bytes -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
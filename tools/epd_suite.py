@@ -0,0 +1,137 @@
+# tools/epd_suite.py
+"""
+Solve rate of a bot on an EPD test suite at several time budgets.
+
+Each position goes to the bot through the same obs interface the
+environment uses, as the first move of a fresh game with no overage bank
+and an actTimeout that leaves the search exactly the budget. A position counts as solved
+when the move is one of its `bm` moves, or avoids all of its `am` moves.
+For bots built on the engine's search (the module keeps a GameState in
+`state`), the nodes searched until the final answer first appeared and
+stayed are reported too.
+
+    python tools/epd_suite.py                                   # WAC subset, search bot
+    python tools/epd_suite.py --budgets 0.01 0.05 0.1 0.5 -v
+    python tools/epd_suite.py --bot submission.bots.hybrid_bot:chess_bot_hybrid
+"""
+import argparse
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+
+import chess
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from submission.engine.board import move_to_uci  # noqa: E402
+from submission.engine.timeman import OVERHEAD  # noqa: E402
+from tests.harness import call_agent  # noqa: E402
+
+DEFAULT_SUITE = ROOT / 'tools' / 'suites' / 'wac.epd'
+DEFAULT_BOT = 'submission.bots.search_bot:chess_bot_search'
+DEFAULT_BUDGETS = [0.01, 0.05, 0.1]
+
+
+def load_suite(path):
+    """[(id, board, bm ucis, am ucis)] for the positions with a bm or am operation"""
+    suite = []
+    for n, line in enumerate(Path(path).read_text().splitlines(), 1):
+        if not line.strip() or line.startswith('#'):
+            continue
+        board, ops = chess.Board.from_epd(line)
+        bm = {m.uci() for m in ops.get('bm', [])}
+        am = {m.uci() for m in ops.get('am', [])}
+        if bm or am:
+            suite.append((ops.get('id', f"line {n}"), board, bm, am))
+    return suite
+
+
+def load_bot(spec):
+    """'package.module:function' -> (bot function, engine Searcher or None)"""
+    module_name, _, name = spec.partition(':')
+    module = importlib.import_module(module_name)
+    state = getattr(module, 'state', None)
+    return getattr(module, name), getattr(state, 'searcher', None)
+
+
+def nodes_to_solution(iterations, move):
+    """Nodes searched by the end of the first iteration from which `move` stayed best"""
+    nodes = None
+    for _, best, searched in iterations:
+        if best != move:
+            nodes = None
+        elif nodes is None:
+            nodes = searched
+    return nodes
+
+
+def run_suite(bot, searcher, suite, budget):
+    """Per-position results for one budget"""
+    # The time manager keeps OVERHEAD of the increment for itself; add it
+    # back so the search gets the whole budget
+    config = {'actTimeout': budget + OVERHEAD}
+    results = []
+    for epd_id, board, bm, am in suite:
+        obs = {
+            'board': board.fen(),
+            'mark': 'white' if board.turn == chess.WHITE else 'black',
+            'step': 0,
+            'remainingOverageTime': 0.0,
+        }
+        if searcher is not None:
+            searcher.iterations = []
+        start = time.perf_counter()
+        uci = call_agent(bot, obs, config)
+        elapsed = time.perf_counter() - start
+        solved = (not bm or uci in bm) and uci not in am
+        result = {'id': epd_id, 'move': uci, 'solved': solved, 'ms': elapsed * 1000}
+        if searcher is not None:
+            iterations = searcher.iterations
+            result['depth'] = iterations[-1][0] if iterations else 0
+            if solved and iterations:
+                final = iterations[-1][1]
+                result['nodes'] = nodes_to_solution(iterations, final) if move_to_uci(final) == uci else None
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--suite', default=DEFAULT_SUITE, help="EPD file with bm/am operations")
+    parser.add_argument('--bot', default=DEFAULT_BOT, help="bot as package.module:function")
+    parser.add_argument('--budgets', type=float, nargs='+', default=DEFAULT_BUDGETS,
+                        help="seconds per move")
+    parser.add_argument('-v', '--verbose', action='store_true', help="print every position")
+    parser.add_argument('--json', help="also write the full results here")
+    args = parser.parse_args()
+
+    suite = load_suite(args.suite)
+    bot, searcher = load_bot(args.bot)
+    print(f"{args.bot}: {len(suite)} positions from {args.suite}")
+    print(f"{'budget':>8} {'solved':>8} {'rate':>6} {'median nodes':>13} {'mean ms':>8}")
+    report = {}
+    for budget in args.budgets:
+        results = run_suite(bot, searcher, suite, budget)
+        report[budget] = results
+        solved = [r for r in results if r['solved']]
+        nodes = sorted(r['nodes'] for r in solved if r.get('nodes') is not None)
+        median = f"{nodes[len(nodes) // 2]}" if nodes else '-'
+        mean_ms = sum(r['ms'] for r in results) / len(results)
+        print(f"{budget * 1000:>6.0f}ms {len(solved):>4}/{len(results):<3} {len(solved) / len(results):>6.0%} "
+              f"{median:>13} {mean_ms:>8.1f}")
+        if args.verbose:
+            for r in results:
+                extra = f"  depth {r['depth']}" if 'depth' in r else ''
+                if r.get('nodes') is not None:
+                    extra += f"  {r['nodes']} nodes to solution"
+                print(f"    {r['id']:<10} {r['move']:<6} {'ok' if r['solved'] else '--'}{extra}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'bot': args.bot, 'suite': str(args.suite), 'results': report}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+# tools/perft.py
+"""
+Perft node counts and move-generation throughput.
+
+Counts leaf nodes to a fixed depth on the standard perft positions with
+each generator (the engine's Position, Chessnut's Game and python-chess as
+the reference), checks them against the published counts and reports
+nodes per second. --divide splits a count by root move, diffs it against
+python-chess and follows the first mismatching move down to the position
+where the move lists differ.
+
+    python tools/perft.py                              # all positions, depth 3
+    python tools/perft.py --depth 4 -g position
+    python tools/perft.py --divide --fen "<fen>" --depth 3 -g chessnut
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import chess
+from Chessnut import Game
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'submission'))
+
+from engine.board import Position, move_to_uci  # noqa: E402
+
+# Name, FEN and published node counts from depth 1; the middlegame sample
+# from tests/conftest.py has no published counts and is checked against
+# python-chess instead
+POSITIONS = [
+    ("start", chess.STARTING_FEN, [20, 400, 8902, 197281, 4865609]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     [48, 2039, 97862, 4085603]),
+    ("endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812, 43238, 674624]),
+    ("promotions", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     [6, 264, 9467, 422333]),
+    ("castling", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     [44, 1486, 62379, 2103487]),
+    ("italian", "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3", []),
+]
+
+
+class PositionGenerator:
+    """The engine's bitboard Position, with make/unmake"""
+    name = 'position'
+
+    def __init__(self, fen):
+        self.pos = Position(fen)
+
+    def perft(self, depth):
+        pos = self.pos
+        if depth == 1:
+            return len(pos.legal_moves())
+        nodes = 0
+        for move in pos.pseudo_legal_moves():
+            if pos.make(move):
+                nodes += self.perft(depth - 1)
+                pos.unmake()
+        return nodes
+
+    def divide(self, depth):
+        counts = {}
+        for move in self.pos.legal_moves():
+            self.pos.make(move)
+            counts[move_to_uci(move)] = self.perft(depth - 1) if depth > 1 else 1
+            self.pos.unmake()
+        return counts
+
+
+class ChessnutGenerator:
+    """Chessnut's Game; it cannot undo moves, so every child is rebuilt from its FEN"""
+    name = 'chessnut'
+
+    def __init__(self, fen):
+        self.fen = fen
+
+    @staticmethod
+    def _children(fen):
+        game = Game(fen)
+        for uci in game.get_moves():
+            child = Game(fen)
+            child.apply_move(uci)
+            yield uci, child.get_fen()
+
+    def _perft(self, fen, depth):
+        if depth == 1:
+            return len(Game(fen).get_moves())
+        return sum(self._perft(child, depth - 1) for _, child in self._children(fen))
+
+    def perft(self, depth):
+        return self._perft(self.fen, depth)
+
+    def divide(self, depth):
+        return {uci: self._perft(child, depth - 1) if depth > 1 else 1
+                for uci, child in self._children(self.fen)}
+
+
+class PythonChessGenerator:
+    """python-chess, the reference"""
+    name = 'python-chess'
+
+    def __init__(self, fen):
+        self.board = chess.Board(fen)
+
+    def perft(self, depth):
+        board = self.board
+        if depth == 1:
+            return board.legal_moves.count()
+        nodes = 0
+        for move in board.legal_moves:
+            board.push(move)
+            nodes += self.perft(depth - 1)
+            board.pop()
+        return nodes
+
+    def divide(self, depth):
+        counts = {}
+        for move in list(self.board.legal_moves):
+            self.board.push(move)
+            counts[move.uci()] = self.perft(depth - 1) if depth > 1 else 1
+            self.board.pop()
+        return counts
+
+
+GENERATORS = {g.name: g for g in (PositionGenerator, ChessnutGenerator, PythonChessGenerator)}
+
+
+def run_perft(generator, fen, depth):
+    """(nodes, seconds) for one perft run"""
+    start = time.perf_counter()
+    nodes = generator(fen).perft(depth)
+    return nodes, time.perf_counter() - start
+
+
+def expected_count(fen, published, depth):
+    if depth <= len(published):
+        return published[depth - 1]
+    return PythonChessGenerator(fen).perft(depth)
+
+
+def divide(generator, fen, depth):
+    """
+    Diff `generator` against python-chess move by move, descending into the
+    first root move whose count differs. Returns the mismatch path as a list
+    of UCI moves, empty if the counts agree.
+    """
+    path = []
+    board = chess.Board(fen)
+    while depth >= 1:
+        ours = generator(board.fen()).divide(depth)
+        reference = PythonChessGenerator(board.fen()).divide(depth)
+        print(f"\n{board.fen()}  depth {depth}: {sum(ours.values())} vs {sum(reference.values())}")
+        missing = sorted(set(reference) - set(ours))
+        extra = sorted(set(ours) - set(reference))
+        if missing or extra:
+            print(f"  missing moves: {' '.join(missing) or '-'}")
+            print(f"  extra moves:   {' '.join(extra) or '-'}")
+            return path
+        wrong = [uci for uci in sorted(reference) if ours[uci] != reference[uci]]
+        for uci in wrong:
+            print(f"  {uci}: {ours[uci]} vs {reference[uci]}")
+        if not wrong:
+            return path
+        path.append(wrong[0])
+        board.push_uci(wrong[0])
+        depth -= 1
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('-g', '--generator', action='append', choices=sorted(GENERATORS),
+                        help="generator to run (repeatable; default: position and chessnut)")
+    parser.add_argument('--fen', help="a single position instead of the standard set")
+    parser.add_argument('--divide', action='store_true', help="diff against python-chess by root move")
+    args = parser.parse_args()
+    names = args.generator or ['position', 'chessnut']
+    positions = [("fen", args.fen, [])] if args.fen else POSITIONS
+
+    if args.divide:
+        failed = False
+        for name in names:
+            for label, fen, _ in positions:
+                print(f"=== {name}: {label}")
+                path = divide(GENERATORS[name], fen, args.depth)
+                if path:
+                    print(f"  mismatch after: {' '.join(path)}")
+                failed |= bool(path)
+        sys.exit(1 if failed else 0)
+
+    failed = False
+    print(f"{'generator':<13} {'position':<11} {'depth':>5} {'nodes':>10} {'seconds':>8} {'nodes/s':>10}  check")
+    for name in names:
+        total_nodes = total_time = 0
+        for label, fen, published in positions:
+            nodes, seconds = run_perft(GENERATORS[name], fen, args.depth)
+            expected = expected_count(fen, published, args.depth)
+            ok = nodes == expected
+            failed |= not ok
+            total_nodes += nodes
+            total_time += seconds
+            print(f"{name:<13} {label:<11} {args.depth:>5} {nodes:>10} {seconds:>8.2f} "
+                  f"{nodes / seconds:>10.0f}  {'ok' if ok else f'FAIL (expected {expected})'}")
+        print(f"{name:<13} {'total':<11} {'':>5} {total_nodes:>10} {total_time:>8.2f} "
+              f"{total_nodes / total_time:>10.0f}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()